@@ -1,9 +1,12 @@
 """
 File to allow access all distribution functions.
 """
+from functools import lru_cache
+
 from . import class_based, entropy_based, time_based, mixed_based, time_slide_window_based
 
 
+@lru_cache(maxsize=None)
 def distributions_funcs(distribution: str):
     """
     Function to decide what distance measure will be used.
@@ -53,3 +56,25 @@ def distributions_funcs(distribution: str):
     if distribution == "TSW_TWB_GLEB_P":
         return time_slide_window_based.mixed_tsw_twb_gleb_with_probability_property
     raise NameError(f"Distribution not found! {distribution}")
+
+
+@lru_cache(maxsize=None)
+def cumulative_distributions_funcs(distribution: str):
+    """
+    Function to get the cumulative version of a distribution, which computes the distribution
+    of each growing prefix of a list in a single pass.
+
+    :param distribution: The acronyms (initials) assigned to a distribution finder.
+    :return: The cumulative function, or None when the distribution has no cumulative version.
+    """
+    cumulative_funcs = {
+        "CWS": class_based.class_weighted_strategy_cumulative,
+        "WPS": class_based.weighted_probability_strategy_cumulative,
+        "PGD": class_based.pure_genre_cumulative,
+        "PGD_P": class_based.pure_genre_with_probability_property_cumulative,
+        "TWB": time_based.time_weighted_based_cumulative,
+        "TWB_P": time_based.time_weighted_based_with_probability_property_cumulative,
+        "TGD": time_based.time_genre_cumulative,
+        "TGD_P": time_based.time_genre_with_probability_property_cumulative,
+    }
+    return cumulative_funcs.get(distribution)
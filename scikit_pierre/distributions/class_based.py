@@ -85,6 +85,86 @@ def pure_genre_with_probability_property(items: dict) -> dict:
     distribution = {g: value / norm for g, value in dist.items()}
     return distribution
 
+
+# ############################################################################################### #
+# ################################### Cumulative (per position) ################################# #
+# ############################################################################################### #
+def class_weighted_strategy_cumulative(items_steps: list) -> list:
+    """
+    The Class Weighted Strategy - (CWS) computed for each growing prefix of a list.
+    The sums are accumulated step by step, instead of recomputed for each prefix.
+
+    :param items_steps: A list where each position holds the list of Item Class instances
+        added to the prefix at that step.
+    :return: A list with the Dict of genre and value after each step.
+    """
+    numerator = {}
+    denominator = {}
+    distributions = []
+
+    def genre(g: str) -> float:
+        if denominator[g] > 0.0 and numerator[g] > 0.0:
+            return numerator[g] / denominator[g]
+        return 0.00001
+
+    for step_items in items_steps:
+        for item in step_items:
+            for category, genre_value in item.classes.items():
+                numerator[category] = numerator.get(category, 0) + item.score * genre_value
+                denominator[category] = denominator.get(category, 0) + item.score
+        distributions.append({g: genre(g) for g in numerator})
+    return distributions
+
+
+def weighted_probability_strategy_cumulative(items_steps: list) -> list:
+    """
+    The Weighted Probability Strategy - (WPS) computed for each growing prefix of a list.
+
+    :param items_steps: A list where each position holds the list of Item Class instances
+        added to the prefix at that step.
+    :return: A list with the Dict of genre and value after each step.
+    """
+    distributions = []
+    for distribution in class_weighted_strategy_cumulative(items_steps):
+        total = sum(value for g, value in distribution.items())
+        distributions.append({g: value / total for g, value in distribution.items()})
+    return distributions
+
+
+def pure_genre_cumulative(items_steps: list) -> list:
+    """
+    The Pure Genre Distribution - (PGD) computed for each growing prefix of a list.
+
+    :param items_steps: A list where each position holds the list of Item Class instances
+        added to the prefix at that step.
+    :return: A list with the Dict of genre and value after each step.
+    """
+    distribution = {}
+    distributions = []
+    for step_items in items_steps:
+        for item in step_items:
+            for category, genre_value in item.classes.items():
+                distribution[category] = distribution.get(category, 0.) + genre_value
+        distributions.append(dict(distribution))
+    return distributions
+
+
+def pure_genre_with_probability_property_cumulative(items_steps: list) -> list:
+    """
+    The Pure Genre Distribution with Probability Property - (PGD_P)
+    computed for each growing prefix of a list.
+
+    :param items_steps: A list where each position holds the list of Item Class instances
+        added to the prefix at that step.
+    :return: A list with the Dict of genre and value after each step.
+    """
+    distributions = []
+    for dist in pure_genre_cumulative(items_steps):
+        norm = sum(dist.values())
+        distributions.append({g: value / norm for g, value in dist.items()})
+    return distributions
+
+
 # ############################################################################################### #
 # ######################################### Unrevised ########################################## #
 # ############################################################################################### #
@@ -1,9 +1,13 @@
 """
 File to transform Dataframe in Item class and Item class in Dataframe.
 """
+import itertools
+from math import ceil
+
+from numpy import searchsorted, zeros
 from pandas import DataFrame, concat
 
-from .accessible import distributions_funcs
+from .accessible import distributions_funcs, cumulative_distributions_funcs
 from ..models.item import ItemsInMemory
 
 
@@ -21,11 +25,10 @@ def computer_users_distribution_pandas(
             and the distribution value as cells.
     """
 
-    def __map_compute_dist_pandas(user_id) -> DataFrame:
+    def __map_compute_dist_pandas(user_group: tuple) -> DataFrame:
+        user_id, user_df = user_group
         user_dist_dict = _distribution_component(
-            items=_item_in_memory.select_user_items(
-                data=users_preference_set[users_preference_set["USER_ID"] == user_id].copy()
-            ),
+            items=_item_in_memory.select_user_items(data=user_df),
         )
         return DataFrame(
                 data=[list(user_dist_dict.values())],
@@ -42,10 +45,10 @@ def computer_users_distribution_pandas(
 
     # Group the preferences by user
     users_preference_set["USER_ID"] = users_preference_set["USER_ID"].astype(str)
-    users_ix = users_preference_set["USER_ID"].unique().tolist()
+    users_groups = users_preference_set.groupby(by="USER_ID", sort=False)
 
     # Compute the distribution to all users
-    users_pref_dist_list = list(map(__map_compute_dist_pandas, users_ix))
+    users_pref_dist_list = list(map(__map_compute_dist_pandas, users_groups))
 
     # users_pref_dist_list = []
     # for user_id in users_ix:
@@ -66,7 +69,8 @@ def computer_users_distribution_pandas(
 
 
 def computer_users_distribution_dict(
-        interactions_df: DataFrame, items_df: DataFrame, distribution: str
+        interactions_df: DataFrame, items_df: DataFrame, distribution: str,
+        item_in_memory: ItemsInMemory = None
 ) -> dict:
     """
 
@@ -75,28 +79,167 @@ def computer_users_distribution_dict(
     :param items_df: A Pandas DataFrame of items with two columns
                     [ITEM_ID, GENRES].
     :param distribution: The string name of the used distribution.
+    :param item_in_memory: An ItemsInMemory instance with the items classes already loaded,
+                    which allows many calls to share it. If None, it is built from items_df.
     :return: Dict
     """
     # Get the items classes
-    _item_in_memory = ItemsInMemory(data=items_df)
-    _item_in_memory.item_by_genre()
+    _item_in_memory = item_in_memory
+    if _item_in_memory is None:
+        _item_in_memory = ItemsInMemory(data=items_df)
+        _item_in_memory.item_by_genre()
 
     # Set the used distribution
     _distribution_component = distributions_funcs(distribution=distribution)
 
-    # Compute the distribution to all users
+    # Compute the distribution to all users, splitting the rows by user in a single pass
     return_dict = {
         user_id: _distribution_component(
-            items=_item_in_memory.select_user_items(
-                data=interactions_df[interactions_df["USER_ID"] == user_id].copy()
-            ),
+            items=_item_in_memory.select_user_items(data=user_df),
         )
-        for user_id in interactions_df["USER_ID"].unique().tolist()
+        for user_id, user_df in interactions_df.groupby(by="USER_ID", sort=False)
     }
 
     return return_dict
 
 
+def computer_users_distribution_by_position(
+        interactions_df: DataFrame, items_df: DataFrame, distribution: str,
+        item_in_memory: ItemsInMemory = None
+) -> list:
+    """
+    Function to compute the users' distributions for each list position (cutoff).
+    The rows are grouped by user once and the items classes are selected once per user,
+    so each cutoff only filters the already selected items. The additive distributions
+    (see cumulative_distributions_funcs) are accumulated position by position instead.
+
+    :param interactions_df: A Pandas DataFrame with the columns [USER_ID, ITEM_ID, ORDER]
+                            and the feedback column (PREDICTED_VALUE or TRANSACTION_VALUE).
+    :param items_df: A Pandas DataFrame of items with two columns
+                    [ITEM_ID, GENRES].
+    :param distribution: The string name of the used distribution.
+    :param item_in_memory: An ItemsInMemory instance with the items classes already loaded,
+                    which allows many calls to share it. If None, it is built from items_df.
+    :return: A list where the position i - 1 holds the Dict of the users' distributions
+            computed with the rows where ORDER <= i.
+    """
+    # Get the items classes
+    if item_in_memory is None:
+        item_in_memory = ItemsInMemory(data=items_df)
+        item_in_memory.item_by_genre()
+
+    list_size = interactions_df["ORDER"].max()
+
+    # Set the used distribution
+    _distribution_component = distributions_funcs(distribution=distribution)
+    _cumulative_component = cumulative_distributions_funcs(distribution=distribution)
+
+    # Compute the distribution to all users and positions
+    positions_list = [{} for _ in range(list_size)]
+    for user_id, user_df in interactions_df.groupby(by="USER_ID", sort=False):
+        orders = user_df["ORDER"].to_numpy()
+        # The time normalization depends on all the rows used
+        user_items = None if "TIMESTAMP" in interactions_df.columns \
+            else item_in_memory.select_user_items(data=user_df)
+
+        # With the time normalization, or repeated items (overwritten by the last row),
+        # the selection must follow the cutoff
+        if user_items is None or len(user_items) != len(orders):
+            user_dists = _user_distribution_by_prefix(
+                user_df, orders, list_size, _distribution_component, item_in_memory
+            )
+        # Additive distributions accumulate the items of each position in a single pass
+        elif _cumulative_component is not None:
+            user_dists = _user_distribution_cumulative(
+                user_items, orders, list_size, _cumulative_component
+            )
+        else:
+            user_dists = _user_distribution_by_items(
+                user_items, orders, list_size, _distribution_component
+            )
+
+        for i, user_dist in enumerate(user_dists):
+            if user_dist is not None:
+                positions_list[i][user_id] = user_dist
+
+    return positions_list
+
+
+def _user_distribution_by_prefix(
+        user_df: DataFrame, orders, list_size: int, distribution_component,
+        item_in_memory: ItemsInMemory
+) -> list:
+    """
+    Function to compute one user distribution for each cutoff, selecting the items classes
+    of each prefix. Only the user rows are sliced, as a prefix view when they already follow
+    the list order.
+
+    :param user_df: A Pandas DataFrame with the user rows.
+    :param orders: A Numpy array with the ORDER column of the user rows.
+    :param list_size: The number of cutoffs.
+    :param distribution_component: The distribution function.
+    :param item_in_memory: An ItemsInMemory instance with the items classes already loaded.
+    :return: A list with the user distribution of each cutoff, None when it has no rows.
+    """
+    in_order = bool((orders[1:] >= orders[:-1]).all())
+    user_dists = []
+    for i in range(1, list_size + 1):
+        if in_order:
+            user_pos_df = user_df.iloc[:searchsorted(orders, i, side="right")]
+        else:
+            user_pos_df = user_df[orders <= i]
+        user_dists.append(
+            distribution_component(items=item_in_memory.select_user_items(data=user_pos_df))
+            if len(user_pos_df) > 0 else None
+        )
+    return user_dists
+
+
+def _user_distribution_by_items(
+        user_items: dict, orders, list_size: int, distribution_component
+) -> list:
+    """
+    Function to compute one user distribution for each cutoff, filtering the items classes
+    already selected for the whole list.
+
+    :param user_items: A Dict with the user items classes, following the user rows.
+    :param orders: A Numpy array with the ORDER column of the user rows.
+    :param list_size: The number of cutoffs.
+    :param distribution_component: The distribution function.
+    :return: A list with the user distribution of each cutoff, None when it has no items.
+    """
+    items_and_orders = list(zip(user_items.items(), orders))
+    user_dists = []
+    for i in range(1, list_size + 1):
+        items = {item_id: item for (item_id, item), order in items_and_orders if order <= i}
+        user_dists.append(distribution_component(items=items) if items else None)
+    return user_dists
+
+
+def _user_distribution_cumulative(
+        user_items: dict, orders, list_size: int, cumulative_component
+) -> list:
+    """
+    Function to compute one user distribution for each cutoff with an additive distribution,
+    accumulating the items of each position in a single pass.
+
+    :param user_items: A Dict with the user items classes, following the user rows.
+    :param orders: A Numpy array with the ORDER column of the user rows.
+    :param list_size: The number of cutoffs.
+    :param cumulative_component: The cumulative distribution function.
+    :return: A list with the user distribution of each cutoff, None before the first item.
+    """
+    items_steps = [[] for _ in range(list_size)]
+    for item, order in zip(user_items.values(), orders):
+        items_steps[max(ceil(order), 1) - 1].append(item)
+    user_dists = []
+    n_items = 0
+    for step_items, user_dist in zip(items_steps, cumulative_component(items_steps)):
+        n_items += len(step_items)
+        user_dists.append(user_dist if n_items > 0 else None)
+    return user_dists
+
+
 def transform_to_vec(target_dist: dict, realized_dist: dict):
     """
 
@@ -104,29 +247,117 @@ def transform_to_vec(target_dist: dict, realized_dist: dict):
     :param realized_dist:
     :return:
     """
+    columns_list = list(set(list(target_dist.keys()) + list(realized_dist.keys())))
+    p = [float(target_dist.get(column, 0.0)) for column in columns_list]
+    q = [float(realized_dist.get(column, 0.0)) for column in columns_list]
 
-    def __map_transform_to_vec(column):
-        """
+    return p, q
 
-        :param column:
-        :return:
-        """
-        if column in target_dist:
-            pc = float(target_dist[str(column)])
-        else:
-            pc = 0.0
 
-        if column in realized_dist:
-            qc = float(realized_dist[str(column)])
-        else:
-            qc = 0.0
+def genres_index(genres) -> dict:
+    """
+    Function to give each genre a stable column position, following the genres sorted order.
 
-        return pc, qc
+    :param genres: An iterable with the genres, which may repeat.
+    :return: A Dict with the genres as keys and the column positions as values.
+    """
+    return {genre: i for i, genre in enumerate(sorted(set(genres)))}
 
-    columns_list = list(set(list(target_dist.keys()) + list(realized_dist.keys())))
-    dist_tuple = list(map(__map_transform_to_vec, columns_list))
-    p = [t[0] for t in dist_tuple]
-    q = [t[1] for t in dist_tuple]
 
+def distribution_to_matrix(users_dist: dict, users_ix: list, columns_index: dict):
+    """
+    Function to stack the users' distributions in one matrix, aligned to a genre index.
+
+    :param users_dist: A Dict with the users' ids as keys and the distributions.
+    :param users_ix: A list with the users' ids, which defines the order of the rows.
+    :param columns_index: A Dict with the genres columns positions (see genres_index), which
+            must hold every genre of the distributions.
+    :return: A Numpy array with shape (n_users, n_genres), where the row i holds the
+            distribution from the user users_ix[i]. Absent genres are filled with 0.0.
+    """
+    matrix = zeros((len(users_ix), len(columns_index)))
+    for row, ix in enumerate(users_ix):
+        for column, value in users_dist[ix].items():
+            matrix[row, columns_index[column]] = value
+    return matrix
+
+
+def transform_to_matrix(
+        target_dist: dict, realized_dist: dict, users_ix: list, with_presence: bool = False,
+        columns_index: dict = None
+):
+    """
+    Function to stack the users' distributions in two aligned matrices.
+
+    :param target_dist: A Dict with the users' ids as keys and the target distributions.
+    :param realized_dist: A Dict with the users' ids as keys and the realized distributions.
+    :param users_ix: A list with the users' ids, which defines the order of the rows.
+    :param with_presence: If True, a boolean matrix flagging the genres present in the target
+            or realized distribution of each user is also returned.
+    :param columns_index: A Dict with the genres columns positions (see genres_index), which
+            must hold every genre of the distributions. If None, it is built from them.
+    :return: Two Numpy arrays with shape (n_users, n_genres), where the row i holds the
+            p and q from the user users_ix[i]. Absent genres are filled with 0.0.
+    """
+    if columns_index is None:
+        columns_index = genres_index(itertools.chain.from_iterable(
+            itertools.chain(target_dist[ix].keys(), realized_dist[ix].keys())
+            for ix in users_ix
+        ))
+
+    p = zeros((len(users_ix), len(columns_index)))
+    q = zeros((len(users_ix), len(columns_index)))
+    presence = zeros((len(users_ix), len(columns_index)), dtype=bool)
+    for row, ix in enumerate(users_ix):
+        for column, value in target_dist[ix].items():
+            p[row, columns_index[column]] = value
+            presence[row, columns_index[column]] = True
+        for column, value in realized_dist[ix].items():
+            q[row, columns_index[column]] = value
+            presence[row, columns_index[column]] = True
+
+    if with_presence:
+        return p, q, presence
     return p, q
 
+
+def transform_to_tensor(
+        target_dist: dict, realized_dist_list: list, users_ix: list, columns_index: dict = None
+):
+    """
+    Function to stack the users' distributions of many cutoffs in aligned arrays,
+    sharing one genre index among all positions.
+
+    :param target_dist: A Dict with the users' ids as keys and the target distributions.
+    :param realized_dist_list: A list of Dicts, one per position, with the users' ids as keys
+            and the realized distributions.
+    :param users_ix: A list with the users' ids, which defines the order of the rows.
+    :param columns_index: A Dict with the genres columns positions (see genres_index), which
+            must hold every genre of the distributions. If None, it is built from them.
+    :return: Three Numpy arrays. The p with shape (n_users, n_genres), the q with shape
+            (n_positions, n_users, n_genres) and the boolean presence with the q shape, flagging
+            the genres present in the target or realized distribution of each user and position.
+            Absent genres are filled with 0.0.
+    """
+    if columns_index is None:
+        columns_index = genres_index(itertools.chain.from_iterable(
+            dist[ix].keys() for dist in [target_dist] + realized_dist_list for ix in users_ix
+        ))
+
+    p = zeros((len(users_ix), len(columns_index)))
+    target_presence = zeros((len(users_ix), len(columns_index)), dtype=bool)
+    for row, ix in enumerate(users_ix):
+        for column, value in target_dist[ix].items():
+            p[row, columns_index[column]] = value
+            target_presence[row, columns_index[column]] = True
+
+    q = zeros((len(realized_dist_list), len(users_ix), len(columns_index)))
+    presence = zeros(q.shape, dtype=bool)
+    presence[:] = target_presence
+    for position, realized_dist in enumerate(realized_dist_list):
+        for row, ix in enumerate(users_ix):
+            for column, value in realized_dist[ix].items():
+                q[position, row, columns_index[column]] = value
+                presence[position, row, columns_index[column]] = True
+
+    return p, q, presence
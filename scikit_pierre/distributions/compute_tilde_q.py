@@ -1,18 +1,35 @@
 """
 This file presents the distribution tilde q, which deals with the zero problem.
 """
+from numpy import ndarray
 
 
 def compute_tilde_q(p: list, q: list, alpha: float = 0.01) -> list:
     """
     Function to compute the tilde q distribution values.
 
-    :param p: A list with float numbers, which represents the distribution values,
+    :param p: A list or Numpy array with float numbers, which represents the distribution values,
                 p and q need to be the same size.
-    :param q: A list with float numbers, which represents the distribution values,
+    :param q: A list or Numpy array with float numbers, which represents the distribution values,
                 p and q need to be the same size.
     :param alpha: Trade-off weight value to Realized distribution \tilde{q}
 
     :return: A list with floats numbers that represent the new realized distribution values.
+        When p and q are Numpy arrays, a Numpy array is returned.
     """
+    if isinstance(p, ndarray) and isinstance(q, ndarray):
+        return (1 - alpha) * q + alpha * p
     return [(1 - alpha) * j + alpha * i for i, j in zip(p, q)]
+
+
+def compute_tilde_q_batch(p: ndarray, q: ndarray, alpha: float = 0.01) -> ndarray:
+    """
+    Function to compute the tilde q distribution values of many users at once.
+
+    :param p: A Numpy array with shape (n_users, n_genres), which represents the distributions.
+    :param q: A Numpy array with shape (n_users, n_genres), which represents the distributions.
+    :param alpha: Trade-off weight value to Realized distribution \tilde{q}
+
+    :return: A Numpy array with shape (n_users, n_genres) with the new realized distributions.
+    """
+    return (1 - alpha) * q + alpha * p
@@ -98,6 +98,98 @@ def time_genre_with_probability_property(items: dict) -> dict:
     distribution = {g: value / norm for g, value in dist.items()}
     return distribution
 
+
+# ############################################################################################### #
+# ################################### Cumulative (per position) ################################# #
+# ############################################################################################### #
+def time_weighted_based_cumulative(items_steps: list) -> list:
+    """
+    The Time Weight Based - (TWB) computed for each growing prefix of a list.
+    The sums are accumulated step by step, instead of recomputed for each prefix.
+    The items time must not depend on the prefix (e.g. it comes from the list ORDER).
+
+    :param items_steps: A list where each position holds the list of Item Class instances
+        added to the prefix at that step.
+    :return: A list with the Dict of genre and value after each step.
+    """
+    numerator = {}
+    denominator = {}
+    distributions = []
+
+    def genre(g: str) -> float:
+        if denominator[g] > 0.0 and numerator[g] > 0.0:
+            return numerator[g] / denominator[g]
+        return 0.00001
+
+    for step_items in items_steps:
+        for item in step_items:
+            for category, genre_value in item.classes.items():
+                numerator[category] = numerator.get(category,
+                                                    0) + item.time * item.score * genre_value
+                denominator[category] = denominator.get(category, 0) + item.score
+        distributions.append({g: genre(g) for g in numerator})
+    return distributions
+
+
+def time_weighted_based_with_probability_property_cumulative(items_steps: list) -> list:
+    """
+    The Time Weight Based with Probability Property - (TWB_P)
+    computed for each growing prefix of a list.
+
+    :param items_steps: A list where each position holds the list of Item Class instances
+        added to the prefix at that step.
+    :return: A list with the Dict of genre and value after each step.
+    """
+    distributions = []
+    for distribution in time_weighted_based_cumulative(items_steps):
+        total = sum(value for g, value in distribution.items())
+        distributions.append({g: value / total for g, value in distribution.items()})
+    return distributions
+
+
+def time_genre_cumulative(items_steps: list) -> list:
+    """
+    The Time Genre Distribution - (TGD) computed for each growing prefix of a list.
+    The items time must not depend on the prefix (e.g. it comes from the list ORDER).
+
+    :param items_steps: A list where each position holds the list of Item Class instances
+        added to the prefix at that step.
+    :return: A list with the Dict of genre and value after each step.
+    """
+    numerator = {}
+    denominator = {}
+    distributions = []
+
+    def genre(g: str) -> float:
+        if denominator[g] > 0.0 and numerator[g] > 0.0:
+            return numerator[g] / denominator[g]
+        return 0.00001
+
+    for step_items in items_steps:
+        for item in step_items:
+            for category, genre_value in item.classes.items():
+                numerator[category] = numerator.get(category, 0.) + item.time * genre_value
+                denominator[category] = denominator.get(category, 0.) + item.time
+        distributions.append({g: genre(g) for g in numerator})
+    return distributions
+
+
+def time_genre_with_probability_property_cumulative(items_steps: list) -> list:
+    """
+    The Time Genre Distribution with Probability Property - (TGD_P)
+    computed for each growing prefix of a list.
+
+    :param items_steps: A list where each position holds the list of Item Class instances
+        added to the prefix at that step.
+    :return: A list with the Dict of genre and value after each step.
+    """
+    distributions = []
+    for dist in time_genre_cumulative(items_steps):
+        norm = sum(dist.values())
+        distributions.append({g: value / norm for g, value in dist.items()})
+    return distributions
+
+
 # ############################################################################################### #
 # ######################################### Unrevised ########################################### #
 # ############################################################################################### #
@@ -6,7 +6,6 @@ which used the timestamp data.
 from collections import defaultdict
 
 import math
-from statistics import mean
 
 from .class_based import class_weighted_strategy
 from .entropy_based import global_local_entropy_based
@@ -64,7 +63,7 @@ def temporal_slide_window_base_function(items: dict, major: int = 10, using: str
 
         distribution = {}
         for key, value in dd.items():
-            distribution[key] = mean(value)
+            distribution[key] = sum(value) / len(value)
     else:
         distribution = base_distribution(items)
 
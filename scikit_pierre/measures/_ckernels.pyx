@@ -0,0 +1,133 @@
+# cython: language_level=3, boundscheck=False, wraparound=False, cdivision=True
+"""
+This file contains the compiled kernels of the divergence measures.
+The zero values receive the same treatment given by the Python implementations, and the
+loops stop at the shortest input, as zip does.
+"""
+from libc.math cimport NAN, fabs, fmin, log
+
+
+cpdef double kl(const double[::1] p, const double[::1] q) noexcept nogil:
+    """
+    Kullback-Leibler (p, q) divergence kernel.
+
+    :param p: A contiguous float64 array, which represents the distribution values.
+    :param q: A contiguous float64 array, which represents the distribution values.
+    :return: A float between [0;+inf], which represent the distance between p and q.
+    """
+    cdef Py_ssize_t i
+    cdef Py_ssize_t n = min(p.shape[0], q.shape[0])
+    cdef double p_a, q_b
+    cdef double total = 0.0
+    for i in range(n):
+        p_a = p[i] if p[i] != 0 else 0.00001
+        q_b = q[i] if q[i] != 0 else 0.00001
+        total += p_a * log(p_a / q_b)
+    return total
+
+
+cpdef double jensen_shannon(const double[::1] p, const double[::1] q) noexcept nogil:
+    """
+    Jensen Shannon (p, q) divergence kernel.
+
+    :param p: A contiguous float64 array, which represents the distribution values.
+    :param q: A contiguous float64 array, which represents the distribution values.
+    :return: A float between [0;+inf], which represent the distance between p and q.
+    """
+    cdef Py_ssize_t i
+    cdef Py_ssize_t n = min(p.shape[0], q.shape[0])
+    cdef double p_a, q_b
+    cdef double left = 0.0
+    cdef double right = 0.0
+    for i in range(n):
+        p_a = p[i] if p[i] != 0 else 0.00001
+        q_b = q[i] if q[i] != 0 else 0.00001
+        left += p_a * log((2 * p_a) / (p_a + q_b))
+        right += q_b * log((2 * q_b) / (p_a + q_b))
+    return (1.0 / 2.0) * (left + right)
+
+
+cpdef double vicis_wave_hedges(const double[::1] p, const double[::1] q) noexcept nogil:
+    """
+    Vicis-Wave Hedges (p, q) divergence kernel.
+
+    :param p: A contiguous float64 array, which represents the distribution values.
+    :param q: A contiguous float64 array, which represents the distribution values.
+    :return: A float between [0;+inf], which represent the distance between p and q.
+    """
+    cdef Py_ssize_t i
+    cdef Py_ssize_t n = min(p.shape[0], q.shape[0])
+    cdef double p_a, q_b
+    cdef double total = 0.0
+    for i in range(n):
+        p_a = p[i] if p[i] != 0 else 0.00001
+        q_b = q[i] if q[i] != 0 else 0.00001
+        total += fabs(p_a - q_b) / fmin(p_a, q_b)
+    return total
+
+
+cpdef double mean_absolute_error(const double[::1] p, const double[::1] q) noexcept nogil:
+    """
+    Mean absolute error (p, q) kernel, used as the Absolute Calibration Error.
+
+    :param p: A contiguous float64 array, which represents the distribution values.
+    :param q: A contiguous float64 array, which represents the distribution values.
+    :return: A float between [0;1], which represent the mean absolute difference between p and q.
+        The empty case returns NaN, as the NumPy mean does.
+    """
+    cdef Py_ssize_t i
+    cdef Py_ssize_t n = min(p.shape[0], q.shape[0])
+    cdef double total = 0.0
+    if n == 0:
+        return NAN
+    for i in range(n):
+        total += fabs(p[i] - q[i])
+    return total / n
+
+
+cpdef void kl_rows(
+        const double[:, ::1] p, const double[:, ::1] q, double[::1] out
+) noexcept nogil:
+    """
+    Kullback-Leibler (p, q) divergence kernel applied to each row, in a single pass.
+
+    :param p: A C-contiguous float64 matrix with one distribution per row.
+    :param q: A C-contiguous float64 matrix with one distribution per row.
+    :param out: A float64 array that receives the divergence of each row.
+    """
+    cdef Py_ssize_t r, i
+    cdef Py_ssize_t n_rows = min(p.shape[0], q.shape[0], out.shape[0])
+    cdef Py_ssize_t n_columns = min(p.shape[1], q.shape[1])
+    cdef double p_a, q_b, total
+    for r in range(n_rows):
+        total = 0.0
+        for i in range(n_columns):
+            p_a = p[r, i] if p[r, i] != 0 else 0.00001
+            q_b = q[r, i] if q[r, i] != 0 else 0.00001
+            total += p_a * log(p_a / q_b)
+        out[r] = total
+
+
+cpdef void jensen_shannon_rows(
+        const double[:, ::1] p, const double[:, ::1] q, double[::1] out
+) noexcept nogil:
+    """
+    Jensen Shannon (p, q) divergence kernel applied to each row, in a single pass.
+
+    :param p: A C-contiguous float64 matrix with one distribution per row.
+    :param q: A C-contiguous float64 matrix with one distribution per row.
+    :param out: A float64 array that receives the divergence of each row.
+    """
+    cdef Py_ssize_t r, i
+    cdef Py_ssize_t n_rows = min(p.shape[0], q.shape[0], out.shape[0])
+    cdef Py_ssize_t n_columns = min(p.shape[1], q.shape[1])
+    cdef double p_a, q_b, left, right
+    for r in range(n_rows):
+        left = 0.0
+        right = 0.0
+        for i in range(n_columns):
+            p_a = p[r, i] if p[r, i] != 0 else 0.00001
+            q_b = q[r, i] if q[r, i] != 0 else 0.00001
+            left += p_a * log((2 * p_a) / (p_a + q_b))
+            right += q_b * log((2 * q_b) / (p_a + q_b))
+        out[r] = (1.0 / 2.0) * (left + right)
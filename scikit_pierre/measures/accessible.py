@@ -1,11 +1,13 @@
 """
 This file contains the call to all similarity and divergence measure.
 """
+from functools import lru_cache
 
 from . import minkowski, l1, intersection, inner_product, shannon, fidelity, chi, combinations, \
     vicissitude
 
 
+@lru_cache(maxsize=None)
 def calibration_measures_funcs(measure: str = "KL"):
     """
     Function to decide what distance measure will be used.
@@ -139,6 +141,33 @@ def calibration_measures_funcs(measure: str = "KL"):
     raise NameError(f"Measure not found! {measure}")
 
 
+@lru_cache(maxsize=None)
+def calibration_measures_batch_funcs(measure: str = "KL"):
+    """
+    Function to decide what vectorized distance measure will be used.
+    The vectorized measures receive two matrices and return one value for each row.
+    Only the measures where the genres absent from both distributions add nothing are listed,
+    since the matrices hold every genre of the items set.
+
+    :param measure: The acronyms (initials) assigned to a distance measure, which will be used by.
+    :return: The choose function or None, when the measure has no vectorized implementation.
+    """
+    # Fidelity Family
+    if measure == "HELLINGER":
+        return fidelity.hellinger_batch
+    # Chi Square Family
+    if measure == "SQUARED_EUCLIDEAN":
+        return chi.squared_euclidean_batch
+    if measure == "CHI_SQUARE":
+        return chi.person_chi_square_batch
+    # Shannon's Entropy Family
+    if measure == "KL":
+        return shannon.kullback_leibler_batch
+    if measure == "JENSEN_SHANNON":
+        return shannon.jensen_shannon_batch
+    return None
+
+
 SIMILARITY_LIST = [
     # Intersection
     'INTERSECTION_SIM',
@@ -3,6 +3,8 @@ This file contains all chi family equations.
 """
 import math
 
+from numpy import where
+
 
 def squared_euclidean(p: list, q: list) -> float:
     """
@@ -214,3 +216,28 @@ def additive_symmetric_chi_squared(p: list, q: list) -> float:
             return 0.0
 
     return sum(compute(p_i, q_i) for p_i, q_i in zip(p, q))
+
+
+def squared_euclidean_batch(p, q):
+    """
+    Squared Euclidean (p, q) divergence computed for many distributions at once.
+    Each row is a pair of distributions.
+
+    :param p: A Numpy array with shape (n_users, n_genres), which represents the distributions.
+    :param q: A Numpy array with shape (n_users, n_genres), which represents the distributions.
+    :return: A Numpy array with one divergence value for each row.
+    """
+    return ((p - q) ** 2).sum(axis=1)
+
+
+def person_chi_square_batch(p, q):
+    """
+    Pearson Chi-Square (p, q) divergence computed for many distributions at once.
+    Each row is a pair of distributions, the zero values receive the same treatment
+    given by person_chi_square.
+
+    :param p: A Numpy array with shape (n_users, n_genres), which represents the distributions.
+    :param q: A Numpy array with shape (n_users, n_genres), which represents the distributions.
+    :return: A Numpy array with one divergence value for each row.
+    """
+    return (((p - q) ** 2) / where(q == 0, 0.00001, q)).sum(axis=1)
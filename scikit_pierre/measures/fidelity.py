@@ -4,6 +4,8 @@ This file contains all fidelity family equations.
 
 import math
 
+from numpy import sqrt as np_sqrt
+
 
 def fidelity(p: list, q: list) -> float:
     """
@@ -117,3 +119,15 @@ def squared_chord_divergence(p: list, q: list) -> float:
     :return: A float between [0;+inf], which represent the distance between p and q.
     """
     return sum((math.sqrt(p_i) - math.sqrt(q_i)) ** 2 for p_i, q_i in zip(p, q))
+
+
+def hellinger_batch(p, q):
+    """
+    Hellinger (p, q) divergence computed for many distributions at once.
+    Each row is a pair of distributions.
+
+    :param p: A Numpy array with shape (n_users, n_genres), which represents the distributions.
+    :param q: A Numpy array with shape (n_users, n_genres), which represents the distributions.
+    :return: A Numpy array with one divergence value for each row.
+    """
+    return np_sqrt(2 * ((np_sqrt(p) - np_sqrt(q)) ** 2).sum(axis=1))
@@ -4,6 +4,17 @@ This file contains all shanon family equations.
 
 from math import log
 
+from numpy import ascontiguousarray, empty, float64, log as np_log, where
+
+try:
+    from ._ckernels import kl as _c_kl, jensen_shannon as _c_jensen_shannon, \
+        kl_rows as _c_kl_rows, jensen_shannon_rows as _c_jensen_shannon_rows
+except ImportError:
+    _c_kl = None
+    _c_jensen_shannon = None
+    _c_kl_rows = None
+    _c_jensen_shannon_rows = None
+
 
 def kullback_leibler(p: list, q: list) -> float:
     """
@@ -23,11 +34,13 @@ def kullback_leibler(p: list, q: list) -> float:
                 p and q need to be the same size.
     :return: A float between [0;+inf], which represent the distance between p and q.
     """
+    if _c_kl is not None:
+        return _c_kl(ascontiguousarray(p, dtype=float64), ascontiguousarray(q, dtype=float64))
 
-    def compute(p_i: float, q_i: float) -> float:
-        p_a = 0.00001 if p_i == 0 else p_i
-        q_b = 0.00001 if q_i == 0 else q_i
-        return p_a * log(p_a / q_b)
+    def compute(p_i: float, q_i: float, _log=log, _eps=1e-5) -> float:
+        p_a = _eps if p_i == 0 else p_i
+        q_b = _eps if q_i == 0 else q_i
+        return p_a * _log(p_a / q_b)
 
     return sum(compute(p_i, q_i) for p_i, q_i in zip(p, q))
 
@@ -47,10 +60,10 @@ def jeffreys(p: list, q: list) -> float:
     :return: A float between [0;+inf], which represent the distance between p and q.
     """
 
-    def compute(p_i: float, q_i: float) -> float:
-        p_a = 0.00001 if p_i == 0 else p_i
-        q_b = 0.00001 if q_i == 0 else q_i
-        return (p_a - q_b) * log(p_a / q_b)
+    def compute(p_i: float, q_i: float, _log=log, _eps=1e-5) -> float:
+        p_a = _eps if p_i == 0 else p_i
+        q_b = _eps if q_i == 0 else q_i
+        return (p_a - q_b) * _log(p_a / q_b)
 
     return sum(compute(p_i, q_i) for p_i, q_i in zip(p, q))
 
@@ -70,10 +83,10 @@ def k_divergence(p: list, q: list) -> float:
     :return: A float between [0;+inf], which represent the distance between p and q.
     """
 
-    def compute(p_i: float, q_i: float) -> float:
-        p_a = 0.00001 if p_i == 0 else p_i
-        q_b = 0.00001 if q_i == 0 else q_i
-        return p_a * log((2 * p_a) / (p_a + q_b))
+    def compute(p_i: float, q_i: float, _log=log, _eps=1e-5) -> float:
+        p_a = _eps if p_i == 0 else p_i
+        q_b = _eps if q_i == 0 else q_i
+        return p_a * _log((2 * p_a) / (p_a + q_b))
 
     return sum(compute(p_i, q_i) for p_i, q_i in zip(p, q))
 
@@ -93,10 +106,10 @@ def topsoe(p: list, q: list) -> float:
     :return: A float between [0;+inf], which represent the distance between p and q.
     """
 
-    def compute(p_i: float, q_i: float) -> float:
-        p_a = 0.00001 if p_i == 0 else p_i
-        q_b = 0.00001 if q_i == 0 else q_i
-        return (p_a * log((2 * p_a) / (p_a + q_b))) + (q_b * log((2 * q_b) / (p_a + q_b)))
+    def compute(p_i: float, q_i: float, _log=log, _eps=1e-5) -> float:
+        p_a = _eps if p_i == 0 else p_i
+        q_b = _eps if q_i == 0 else q_i
+        return (p_a * _log((2 * p_a) / (p_a + q_b))) + (q_b * _log((2 * q_b) / (p_a + q_b)))
 
     return sum(compute(p_i, q_i) for p_i, q_i in zip(p, q))
 
@@ -115,16 +128,20 @@ def jensen_shannon(p: list, q: list) -> float:
                 p and q need to be the same size.
     :return: A float between [0;+inf], which represent the distance between p and q.
     """
+    if _c_jensen_shannon is not None:
+        return _c_jensen_shannon(
+            ascontiguousarray(p, dtype=float64), ascontiguousarray(q, dtype=float64)
+        )
 
-    def compute_left(p_i: float, q_i: float) -> float:
-        p_a = 0.00001 if p_i == 0 else p_i
-        q_b = 0.00001 if q_i == 0 else q_i
-        return p_a * log((2 * p_a) / (p_a + q_b))
+    def compute_left(p_i: float, q_i: float, _log=log, _eps=1e-5) -> float:
+        p_a = _eps if p_i == 0 else p_i
+        q_b = _eps if q_i == 0 else q_i
+        return p_a * _log((2 * p_a) / (p_a + q_b))
 
-    def compute_right(p_i: float, q_i: float) -> float:
-        p_a = 0.00001 if p_i == 0 else p_i
-        q_b = 0.00001 if q_i == 0 else q_i
-        return q_b * log((2 * q_b) / (p_a + q_b))
+    def compute_right(p_i: float, q_i: float, _log=log, _eps=1e-5) -> float:
+        p_a = _eps if p_i == 0 else p_i
+        q_b = _eps if q_i == 0 else q_i
+        return q_b * _log((2 * q_b) / (p_a + q_b))
 
     return (1 / 2) * (sum(compute_left(p_i, q_i) for p_i, q_i in zip(p, q)) +
                       sum(compute_right(p_i, q_i) for p_i, q_i in zip(p, q)))
@@ -145,10 +162,54 @@ def jensen_difference(p: list, q: list) -> float:
     :return: A float between [0;+inf], which represent the distance between p and q.
     """
 
-    def compute(p_i: float, q_i: float) -> float:
-        p_a = 0.00001 if p_i == 0 else p_i
-        q_b = 0.00001 if q_i == 0 else q_i
-        return (((p_a * log(p_a)) + (q_b * log(q_b))) / 2) - (
-                    ((p_a + q_b) / 2) * log((p_a + q_b) / 2))
+    def compute(p_i: float, q_i: float, _log=log, _eps=1e-5) -> float:
+        p_a = _eps if p_i == 0 else p_i
+        q_b = _eps if q_i == 0 else q_i
+        return (((p_a * _log(p_a)) + (q_b * _log(q_b))) / 2) - (
+                    ((p_a + q_b) / 2) * _log((p_a + q_b) / 2))
 
     return sum(compute(p_i, q_i) for p_i, q_i in zip(p, q))
+
+
+def kullback_leibler_batch(p, q):
+    """
+    Kullback-Leibler (p, q) divergence computed for many distributions at once.
+    Each row is a pair of distributions, the zero values receive the same treatment
+    given by kullback_leibler.
+
+    :param p: A Numpy array with shape (n_users, n_genres), which represents the distributions.
+    :param q: A Numpy array with shape (n_users, n_genres), which represents the distributions.
+    :return: A Numpy array with one divergence value for each row.
+    """
+    if _c_kl_rows is not None:
+        out = empty(len(p), dtype=float64)
+        _c_kl_rows(ascontiguousarray(p, dtype=float64), ascontiguousarray(q, dtype=float64), out)
+        return out
+
+    p_a = where(p == 0, 0.00001, p)
+    q_b = where(q == 0, 0.00001, q)
+    return (p_a * np_log(p_a / q_b)).sum(axis=1)
+
+
+def jensen_shannon_batch(p, q):
+    """
+    Jensen Shannon (p, q) divergence computed for many distributions at once.
+    Each row is a pair of distributions, the zero values receive the same treatment
+    given by jensen_shannon.
+
+    :param p: A Numpy array with shape (n_users, n_genres), which represents the distributions.
+    :param q: A Numpy array with shape (n_users, n_genres), which represents the distributions.
+    :return: A Numpy array with one divergence value for each row.
+    """
+    if _c_jensen_shannon_rows is not None:
+        out = empty(len(p), dtype=float64)
+        _c_jensen_shannon_rows(
+            ascontiguousarray(p, dtype=float64), ascontiguousarray(q, dtype=float64), out
+        )
+        return out
+
+    p_a = where(p == 0, 0.00001, p)
+    q_b = where(q == 0, 0.00001, q)
+    m = p_a + q_b
+    return (1 / 2) * ((p_a * np_log((2 * p_a) / m)).sum(axis=1)
+                      + (q_b * np_log((2 * q_b) / m)).sum(axis=1))
@@ -1,6 +1,12 @@
 """
 This file contains all vicissitude family equations.
 """
+from numpy import ascontiguousarray, float64
+
+try:
+    from ._ckernels import vicis_wave_hedges as _c_vicis_wave_hedges
+except ImportError:
+    _c_vicis_wave_hedges = None
 
 
 def vicis_wave_hedges(p: list, q: list) -> float:
@@ -17,6 +23,10 @@ def vicis_wave_hedges(p: list, q: list) -> float:
                 p and q need to be the same size.
     :return: A float between [0;+inf], which represent the distance between p and q.
     """
+    if _c_vicis_wave_hedges is not None:
+        return _c_vicis_wave_hedges(
+            ascontiguousarray(p, dtype=float64), ascontiguousarray(q, dtype=float64)
+        )
 
     def compute(p_i: float, q_i: float) -> float:
         p_a = 0.00001 if p_i == 0 else p_i
@@ -0,0 +1,37 @@
+# cython: language_level=3, boundscheck=False, wraparound=False, cdivision=True
+"""
+This file contains the compiled kernels of the list metrics.
+Each kernel walks the relevance array once, without temporary arrays.
+"""
+
+
+cpdef double average_precision(const unsigned char[::1] relevance) noexcept nogil:
+    """
+    Precision of one list, the mean among the precision at each position.
+
+    :param relevance: A contiguous uint8 array with 1 (relevant) or 0 in the list positions.
+    :return: A float between [0;1]. The empty list returns 0.0.
+    """
+    cdef Py_ssize_t i
+    cdef Py_ssize_t hits = 0
+    cdef double total = 0.0
+    if relevance.shape[0] == 0:
+        return 0.0
+    for i in range(relevance.shape[0]):
+        hits += relevance[i] != 0
+        total += <double> hits / (i + 1)
+    return total / relevance.shape[0]
+
+
+cpdef double reciprocal_rank(const unsigned char[::1] relevance) noexcept nogil:
+    """
+    Reciprocal rank of one list, the inverse of the first relevant position.
+
+    :param relevance: A contiguous uint8 array with 1 (relevant) or 0 in the list positions.
+    :return: A float between [0;1]. The list without relevant items returns 0.0.
+    """
+    cdef Py_ssize_t i
+    for i in range(relevance.shape[0]):
+        if relevance[i] != 0:
+            return 1.0 / (i + 1)
+    return 0.0
@@ -1,13 +1,75 @@
-from numpy import mean
-from pandas import DataFrame
+import hashlib
+import itertools
+import weakref
+
+from numpy import isin, ndarray, fromiter, float64, lexsort, asarray, concatenate, \
+    cumsum, split, int64, zeros
+from joblib import Parallel, delayed, effective_n_jobs
+from pandas import DataFrame, Index, MultiIndex, Series, factorize
+from pandas.api.types import infer_dtype
+from pandas.util import hash_pandas_object
 
 from scikit_pierre.distributions.accessible import distributions_funcs
+from scikit_pierre.distributions.compute_tilde_q import compute_tilde_q_batch
 from scikit_pierre.distributions.compute_distribution import computer_users_distribution_dict, \
-    transform_to_vec
-from scikit_pierre.measures.accessible import calibration_measures_funcs
+    computer_users_distribution_by_position, transform_to_matrix, transform_to_tensor, \
+    genres_index, distribution_to_matrix, transform_to_vec
+from scikit_pierre.measures.accessible import calibration_measures_funcs, \
+    calibration_measures_batch_funcs
 from scikit_pierre.models.item import ItemsInMemory
 
 
+# Items classes, target distributions and users' items shared by the metrics built over the
+# same Dataframes. The entries are keyed by the Dataframes contents and dropped when one of
+# them is garbage collected.
+_ITEMS_MEMO = {}
+_TARGET_DIST_MEMO = {}
+_USERS_ITEMS_MEMO = {}
+
+
+def _frame_key(df: DataFrame) -> tuple:
+    """
+    Function to give a memo key that follows the Dataframe content, so a Dataframe changed
+    in place does not reuse the values built from its previous content.
+
+    :param df: A Pandas Dataframe.
+    :return: A tuple with the columns names, the dtypes and a digest of the lines hashes.
+    """
+    lines_hashes = hash_pandas_object(df, index=True).to_numpy()
+    return (
+        tuple(df.columns), tuple(str(dtype) for dtype in df.dtypes),
+        hashlib.blake2b(lines_hashes.tobytes(), digest_size=16).digest()
+    )
+
+
+def _memo_by_frames(memo: dict, frames: tuple, key: tuple, builder):
+    """
+    Function to get a value memoized against some Dataframes, building it on the first call.
+
+    :param memo: The Dict used as memo.
+    :param frames: A tuple with the Dataframes the value was built from.
+    :param key: A tuple with the memo key, built with _frame_key from the Dataframes.
+    :param builder: A function without parameters that builds the value.
+    :return: The memoized value.
+    """
+    if key not in memo:
+        memo[key] = builder()
+        for frame in frames:
+            weakref.finalize(frame, memo.pop, key, None)
+    return memo[key]
+
+
+def _map_chunk(func, users_args: list) -> list:
+    """
+    Function to apply a function to a chunk of users, inside one parallel job.
+
+    :param func: The function to be applied.
+    :param users_args: A list with the tuples of arguments of each user.
+    :return: A list with the function results, following the chunk order.
+    """
+    return [func(*user_args) for user_args in users_args]
+
+
 class BaseMetric:
     """
     This is the base class metric to be inherent by all other class metrics.
@@ -41,57 +103,274 @@ class BaseMetric:
         self.grouped_df_2 = None
         self.grouped_df_3 = None
 
+        self.n_jobs = 1
+
+    def set_n_jobs(self, n_jobs: int) -> None:
+        """
+        This method sets the number of jobs used to process the users in parallel.
+
+        :param n_jobs: An int with the number of jobs, following the joblib convention
+            (-1 uses all processors). The default 1 processes the users sequentially.
+        """
+        self.n_jobs = n_jobs
+
+    def map_users(self, func, *users_iterables) -> list:
+        """
+        This method applies the function to each user, in parallel when n_jobs is not 1.
+
+        :param func: The function to be applied, which receives one item of each iterable.
+        :param users_iterables: The iterables with the users' data, e.g. the grouped Dataframes.
+
+        :return: A list with the function results, following the users' order.
+        """
+        if self.n_jobs == 1:
+            return list(map(func, *users_iterables))
+
+        # The users are sent in a few chunks per job, to avoid one dispatch per user
+        users_args = list(zip(*users_iterables))
+        n_chunks = min(len(users_args), 4 * effective_n_jobs(self.n_jobs))
+        chunks_results = Parallel(n_jobs=self.n_jobs)(
+            delayed(_map_chunk)(func, users_args[start::n_chunks]) for start in range(n_chunks)
+        )
+        # The chunks are strided, so the results are interleaved back in the users' order
+        results = [None] * len(users_args)
+        for start, chunk_results in enumerate(chunks_results):
+            results[start::n_chunks] = chunk_results
+        return results
+
+    @staticmethod
+    def mean_of(values: list) -> float:
+        """
+        This method computes the mean of a list of scalars (e.g. the users' results),
+        building the Numpy array in a single pass.
+
+        :param values: A list with the values.
+
+        :return: A float with the mean among the values.
+        """
+        return fromiter(values, dtype=float64, count=len(values)).mean()
+
+    @staticmethod
+    def users_ids_as_str(*columns) -> bool:
+        """
+        This method decides if the users' ids must be compared as strings. The ids are only
+        compared as they are when all the columns hold values of the same kind, which is
+        inferred from the values, since ints and strings may share the object dtype.
+
+        :param columns: The Pandas Series or Numpy arrays with the users' ids.
+
+        :return: True when the ids must be cast to string before being compared.
+        """
+        inferred = {infer_dtype(column, skipna=False) for column in columns}
+        return len(inferred) != 1 or not inferred <= {"integer", "floating", "string"}
+
     def checking_users(self) -> None:
         """
         This method checks if the users ids matches. If it does not match an error is raised.
+        The ids are only cast to string when users_ids_as_str says so.
         """
-        set_1 = set({str(ix) for ix in self.df_1['USER_ID'].unique().tolist()})
-        set_2 = set({str(ix) for ix in self.df_2['USER_ID'].unique().tolist()})
+        users_1 = self.df_1['USER_ID'].unique()
+        users_2 = self.df_2['USER_ID'].unique()
+        if self.users_ids_as_str(users_1, users_2):
+            users_1 = users_1.astype(str)
+            users_2 = users_2.astype(str)
 
-        if set_1 != set_2:
+        if len(users_1) != len(users_2) or not Index(users_1).isin(users_2).all():
             raise IndexError(
                 'Unknown users in recommendation or test set. '
                 'Please make sure the users are the same.'
             )
 
     @staticmethod
-    def get_bool_list(rec_items: tuple, test_items: tuple) -> list:
+    def get_bool_list(rec_items: tuple, test_items: tuple) -> ndarray:
         """
         This method verify which items are in common in the two tuples.
 
         :param rec_items: A tuple where: 0 is the user id and 1 is a Dataframe.
         :param test_items: A tuple where: 0 is the user id and 1 is a Dataframe.
 
-        :return: A list with True or False.
+        :return: A Numpy boolean array with True or False, following the rec_items positions.
         """
-        rec_items_ids = rec_items[1]['ITEM_ID'].tolist()
-        test_items_ids = test_items[1]['ITEM_ID'].tolist()
-        return [x in test_items_ids for x in rec_items_ids]
+        rec_items_ids = rec_items[1]['ITEM_ID'].to_numpy()
+        test_items_ids = test_items[1]['ITEM_ID'].to_numpy()
+        return isin(rec_items_ids, test_items_ids)
 
-    def ordering(self) -> None:
+    @staticmethod
+    def encode_ids(*columns) -> list:
         """
-        This method is to order the Dataframe based on the user ids.
+        This method encodes the ids of some columns to int codes shared among all of them,
+        so the following set operations compare ints instead of hashing the ids again.
+
+        :param columns: The Pandas Series or Numpy arrays with the ids.
+
+        :return: A list with one Numpy int array of codes for each column.
+        """
+        codes, _ = factorize(
+            concatenate([asarray(column) for column in columns]), use_na_sentinel=False
+        )
+        return split(codes, cumsum([len(column) for column in columns])[:-1])
+
+    @staticmethod
+    def get_users_items(df: DataFrame, items_ids: ndarray = None) -> dict:
+        """
+        This method splits the items ids by user, without building one Dataframe per user.
+
+        :param df: A Pandas DataFrame with at least the columns [USER_ID, ITEM_ID].
+        :param items_ids: A Numpy array aligned with the Dataframe lines, used instead of
+            the ITEM_ID column, e.g. the codes given by encode_ids.
+
+        :return: A Dict with the users' ids as keys and Numpy arrays with the users' items ids,
+            following the Dataframe lines order. When the ITEM_ID column is used, the arrays are
+            shared among the metrics that receive a Dataframe with the same content, so they are
+            read only.
+        """
+        if items_ids is None:
+            return dict(_memo_by_frames(
+                _USERS_ITEMS_MEMO, (df,), _frame_key(df[["USER_ID", "ITEM_ID"]]),
+                lambda: BaseMetric._read_only_users_items(df)
+            ))
+        return {
+            user_id: items_ids[user_lines]
+            for user_id, user_lines in df.groupby(by="USER_ID", sort=True).indices.items()
+        }
+
+    @staticmethod
+    def _read_only_users_items(df: DataFrame) -> dict:
+        users_items = BaseMetric.get_users_items(df, df["ITEM_ID"].to_numpy())
+        for items_ids in users_items.values():
+            items_ids.flags.writeable = False
+        return users_items
+
+    @staticmethod
+    def encode_pairs(*dfs) -> list:
+        """
+        This method encodes the (USER_ID, ITEM_ID) pairs of some Dataframes as int64 keys,
+        shared among all of them. The users' ids are cast to string when users_ids_as_str
+        says so.
+
+        :param dfs: The Pandas DataFrames with at least the columns [USER_ID, ITEM_ID].
+
+        :return: A list with one Numpy int64 array of keys for each Dataframe, following its lines.
+        """
+        users_columns = [df["USER_ID"] for df in dfs]
+        if BaseMetric.users_ids_as_str(*users_columns):
+            users_columns = [column.astype(str) for column in users_columns]
+
+        # Each pair is encoded as one int, from the users and items codes
+        users_codes = BaseMetric.encode_ids(*users_columns)
+        items_codes = BaseMetric.encode_ids(*[df["ITEM_ID"] for df in dfs])
+        n_items = max(codes.max(initial=-1) for codes in items_codes) + 1
+        return [
+            users.astype(int64) * n_items + items
+            for users, items in zip(users_codes, items_codes)
+        ]
+
+    @staticmethod
+    def isin_by_user(rec_df: DataFrame, other_df: DataFrame) -> ndarray:
+        """
+        This method verifies, in a single vectorized pass, which (USER_ID, ITEM_ID) pairs
+        of rec_df are also in other_df.
+
+        :param rec_df: A Pandas DataFrame with at least the columns [USER_ID, ITEM_ID].
+        :param other_df: A Pandas DataFrame with at least the columns [USER_ID, ITEM_ID].
+
+        :return: A Numpy boolean array with True or False, following the rec_df lines.
+        """
+        rec_keys, other_keys = BaseMetric.encode_pairs(rec_df, other_df)
+        return Series(rec_keys).isin(other_keys).to_numpy()
+
+    def get_relevance_df(self) -> DataFrame:
+        """
+        This method flags, in a single vectorized pass, which recommended items (df_2)
+        are in the users' test set (df_1).
+
+        :return: A Pandas DataFrame with the columns [USER_ID, RELEVANT], one line per
+            recommended item, ordered by the user id and the list position (ORDER).
+        """
+        rec_df = self.df_2
+        if "ORDER" in rec_df.columns:
+            rec_df = self.sort_if_needed(rec_df, ["USER_ID", "ORDER"])
+        else:
+            rec_df = self.sort_if_needed(rec_df, ["USER_ID"])
+
+        relevant = self.isin_by_user(rec_df, self.df_1)
+        return DataFrame({"USER_ID": rec_df["USER_ID"].to_numpy(), "RELEVANT": relevant})
+
+    @staticmethod
+    def get_relevance_matrix(relevance_df: DataFrame):
+        """
+        This method reshapes the relevance flags in one line per user, when all the users'
+        lists have the same size.
+
+        :param relevance_df: A Pandas DataFrame given by get_relevance_df.
+
+        :return: A Numpy boolean array with shape (n_users, list_size), or None when
+            the lists sizes differ.
+        """
+        lists_sizes = relevance_df.groupby(by="USER_ID", sort=False).size()
+        if len(lists_sizes) == 0 or lists_sizes.nunique() != 1:
+            return None
+        return relevance_df["RELEVANT"].to_numpy().reshape(len(lists_sizes), -1)
+
+    @staticmethod
+    def sort_if_needed(df: DataFrame, by: list) -> DataFrame:
         """
-        if self.df_1 is not None:
-            self.df_1.sort_values(by=['USER_ID'], inplace=True)
+        This method orders the Dataframe lines with a single stable lexsort over the columns,
+        only when it is not already ordered.
 
-        if self.df_2 is not None:
-            self.df_2.sort_values(by=['USER_ID'], inplace=True)
+        :param df: A Pandas Dataframe to be ordered.
+        :param by: A list with the columns names to order by.
 
-        if self.df_3 is not None:
-            self.df_3.sort_values(by=['USER_ID'], inplace=True)
+        :return: The same Dataframe when it is already ordered, otherwise an ordered copy.
+        """
+        if len(by) == 1:
+            is_ordered = df[by[0]].is_monotonic_increasing
+        else:
+            is_ordered = MultiIndex.from_frame(df[by]).is_monotonic_increasing
+        if is_ordered:
+            return df
+        try:
+            return df.take(lexsort([df[column].to_numpy() for column in reversed(by)]))
+        except TypeError:
+            # Columns with ids of mixed types are not comparable by Numpy
+            return df.sort_values(by=by, kind="stable")
+
+    def order_by(self, by: list, *dfs_numbers) -> None:
+        """
+        This method orders some of the Dataframes (df_1, df_2 or df_3) by the columns.
+        The groups of a reordered Dataframe are reset.
+
+        :param by: A list with the columns names to order by.
+        :param dfs_numbers: The numbers of the Dataframes to order, e.g. 1 and 2.
+        """
+        for number in dfs_numbers:
+            df = getattr(self, f"df_{number}")
+            if df is None:
+                continue
+            sorted_df = self.sort_if_needed(df, by=by)
+            if sorted_df is not df:
+                setattr(self, f"df_{number}", sorted_df)
+                setattr(self, f"grouped_df_{number}", None)
+
+    def ordering(self) -> None:
+        """
+        This method is to order the Dataframe based on the user ids.
+        The Dataframes already ordered are not sorted again.
+        """
+        self.order_by(['USER_ID'], 1, 2, 3)
 
     def grouping(self) -> None:
         """
         This method is for grouping the users lines.
+        The groups are kept until the Dataframe is sorted again.
         """
-        if self.df_1 is not None:
+        if self.df_1 is not None and self.grouped_df_1 is None:
             self.grouped_df_1 = self.df_1.groupby(by=['USER_ID'])
 
-        if self.df_2 is not None:
+        if self.df_2 is not None and self.grouped_df_2 is None:
             self.grouped_df_2 = self.df_2.groupby(by=['USER_ID'])
 
-        if self.df_3 is not None:
+        if self.df_3 is not None and self.grouped_df_3 is None:
             self.grouped_df_3 = self.df_3.groupby(by=['USER_ID'])
 
     def ordering_and_grouping(self) -> None:
@@ -122,12 +401,12 @@ class BaseMetric:
         self.checking_users()
         self.ordering_and_grouping()
 
-        users_results = list(map(
+        users_results = self.map_users(
             self.single_process,
             self.grouped_df_2,
             self.grouped_df_1
-        ))
-        return mean(users_results)
+        )
+        return self.mean_of(users_results)
 
 
 class BaseCalibrationMetric(BaseMetric):
@@ -154,54 +433,256 @@ class BaseCalibrationMetric(BaseMetric):
 
         self.items_df = items_set_df
         self._item_in_memory = None
+        self.genre_index = None
 
         self.dist_func = distributions_funcs(distribution=distribution_name)
         self.dist_name = distribution_name
 
         self.calib_measure_func = calibration_measures_funcs(measure=distance_func_name)
+        self.calib_measure_batch_func = calibration_measures_batch_funcs(
+            measure=distance_func_name
+        )
         self.calib_measure_name = distance_func_name
 
         self.users_ix = None
+        self._target_matrix = None
+        self._target_vectors = None
 
     def item_preparation(self) -> None:
         """
+        This method loads the items classes once, to be shared by all distribution computations.
 
         :return:
         """
-        self._item_in_memory = ItemsInMemory(data=self.items_df)
-        self._item_in_memory.item_by_genre()
+        if self._item_in_memory is None:
+            self._item_in_memory = _memo_by_frames(
+                _ITEMS_MEMO, (self.items_df,), _frame_key(self.items_df),
+                self._build_item_in_memory
+            )
+            self.genre_index = genres_index(
+                genre
+                for item in self._item_in_memory.items.values()
+                for genre in item.classes
+            )
+
+    def _build_item_in_memory(self) -> ItemsInMemory:
+        item_in_memory = ItemsInMemory(data=self.items_df)
+        item_in_memory.item_by_genre()
+        return item_in_memory
 
     @staticmethod
     def transform_to_vec(target_dist: dict, realized_dist: dict):
         """
+        This method aligns the two distributions over the union of their genres.
+        Absent genres are filled with 0.0.
 
-        :param target_dist:
-        :param realized_dist:
-        :return:
+        :param target_dist: A Dict with the genres as keys and the distribution values.
+        :param realized_dist: A Dict with the genres as keys and the distribution values.
+        :return: Two lists of Python floats, p and q, with the same genre in each position.
+            The scalar measures rely on Python floats to raise ZeroDivisionError.
         """
         p, q = transform_to_vec(target_dist, realized_dist)
         return p, q
 
+    def get_target_vector(self, ix) -> tuple:
+        """
+        This method gives the user target distribution with its values as a Numpy array,
+        built once per user and reused among the positions and realized distributions.
+
+        :param ix: The user id.
+        :return: A tuple with the target distribution Dict and the float64 array of its values.
+        """
+        if self._target_vectors is None or self._target_vectors[0] is not self.target_dist:
+            self._target_vectors = (self.target_dist, {})
+        target_vectors = self._target_vectors[1]
+        if ix not in target_vectors:
+            target_dist = self.target_dist[ix]
+            target_vectors[ix] = (
+                target_dist, fromiter(target_dist.values(), dtype=float64, count=len(target_dist))
+            )
+        return target_vectors[ix]
+
+    @staticmethod
+    def align_to_target(target_vector: tuple, realized_dist: dict):
+        """
+        This method aligns the realized distribution to a target vector (get_target_vector),
+        over the union of their genres: the target genres first, then the realized only ones.
+        Absent genres are filled with 0.0.
+
+        :param target_vector: A tuple with the target distribution Dict and its values array.
+        :param realized_dist: A Dict with the genres as keys and the distribution values.
+        :return: Two Numpy float64 arrays, p and q, with the same genre in each position.
+        """
+        target_dist, p = target_vector
+        extra_columns = [column for column in realized_dist if column not in target_dist]
+        q = fromiter(
+            itertools.chain(
+                (realized_dist.get(column, 0.0) for column in target_dist),
+                (realized_dist[column] for column in extra_columns)
+            ),
+            dtype=float64, count=len(target_dist) + len(extra_columns)
+        )
+        if extra_columns:
+            p = concatenate((p, zeros(len(extra_columns))))
+        return p, q
+
+    @staticmethod
+    def str_keys(dist: dict) -> dict:
+        """
+        This method casts the users' ids (keys) to string, only when some key is not one.
+
+        :param dist: A Dict with the users' ids as keys and the distributions as values.
+        :return: A Dict with the same values and the users' ids as strings.
+        """
+        if all(isinstance(ix, str) for ix in dist):
+            return dist
+        return {str(ix): value for ix, value in dist.items()}
+
+    def transform_to_matrix(self, realized_dist: dict, with_presence: bool = False):
+        """
+        This method stacks the target and realized distributions of all users (users_ix),
+        one user per row.
+
+        :param realized_dist: A Dict with the users' ids as keys and the distributions as values.
+        :param with_presence: If True, the boolean matrix of the genres present in each user
+            distributions is also returned.
+        :return: Two Numpy arrays with shape (n_users, n_genres).
+        """
+        try:
+            return transform_to_matrix(
+                self.target_dist, realized_dist, self.users_ix, with_presence=with_presence,
+                columns_index=self.genre_index
+            )
+        except KeyError:
+            # Distributions given by the user may hold genres out of the items set
+            return transform_to_matrix(
+                self.target_dist, realized_dist, self.users_ix, with_presence=with_presence
+            )
+
+    def transform_to_tensor(self, realized_dist_list: list):
+        """
+        This method stacks the target distributions and the realized distributions of each
+        position for all users (users_ix).
+
+        :param realized_dist_list: A list of Dicts, one per position, with the users' ids as keys
+            and the distributions as values.
+        :return: The p with shape (n_users, n_genres) and, with shape
+            (n_positions, n_users, n_genres), the q and the boolean genres presence.
+        """
+        try:
+            return transform_to_tensor(
+                self.target_dist, realized_dist_list, self.users_ix,
+                columns_index=self.genre_index
+            )
+        except KeyError:
+            # Distributions given by the user may hold genres out of the items set
+            return transform_to_tensor(self.target_dist, realized_dist_list, self.users_ix)
+
+    def get_target_matrix(self):
+        """
+        This method stacks the target distributions of all users (users_ix) aligned to the
+        genre_index, once. The matrix is kept while the same users_ix is used, e.g. among
+        the positions of a list.
+
+        :return: A Numpy array with shape (n_users, n_genres).
+        """
+        if self._target_matrix is None or self._target_matrix[0] is not self.users_ix:
+            self._target_matrix = (
+                self.users_ix,
+                distribution_to_matrix(self.target_dist, self.users_ix, self.genre_index)
+            )
+        return self._target_matrix[1]
+
+    def compute_batch(self, realized_dist: dict = None, alpha: float = 0.01) -> float:
+        """
+        This method computes the miscalibration of all users with one vectorized call.
+        It is only available when the distance measure has a vectorized implementation.
+
+        :param realized_dist: A Dict with the users' ids as keys and the distributions as values.
+            If it is None, the instance realized distribution is used.
+        :param alpha: Trade-off weight to Realized distribution \tilde{q}
+
+        :return: A float which comprises the mean among the users' miscalibration.
+        """
+        return self.users_miscalibration_batch(realized_dist, alpha).mean()
+
+    def users_miscalibration_batch(self, realized_dist: dict = None, alpha: float = 0.01):
+        """
+        This method computes the miscalibration of each user with one vectorized call.
+        It is only available when the distance measure has a vectorized implementation.
+
+        :param realized_dist: A Dict with the users' ids as keys and the distributions as values.
+            If it is None, the instance realized distribution is used.
+        :param alpha: Trade-off weight to Realized distribution \tilde{q}
+
+        :return: A Numpy array with the users' miscalibration, following the users_ix order.
+        """
+        if realized_dist is None:
+            realized_dist = self.realized_dist
+        p = None
+        if self.genre_index is not None:
+            try:
+                p = self.get_target_matrix()
+                q = distribution_to_matrix(realized_dist, self.users_ix, self.genre_index)
+            except KeyError:
+                # Distributions given by the user may hold genres out of the items set
+                p = None
+        if p is None:
+            p, q = self.transform_to_matrix(realized_dist)
+        tilde_q = compute_tilde_q_batch(p=p, q=q, alpha=alpha)
+        return self.calib_measure_batch_func(p=p, q=tilde_q)
+
     def compute_distribution(self, set_df: DataFrame) -> dict:
         """
 
         :param set_df:
         :return:
         """
+        self.item_preparation()
         dist_dict = computer_users_distribution_dict(
             interactions_df=set_df, items_df=self.items_df,
-            distribution=self.dist_name
+            distribution=self.dist_name, item_in_memory=self._item_in_memory
         )
         return dist_dict
 
+    def compute_distribution_by_position(self, set_df: DataFrame) -> list:
+        """
+        This method computes the users' distributions for each list position (cutoff).
+
+        :param set_df: A Pandas DataFrame with the users' recommendation lists.
+        :return: A list where the position i - 1 holds the distributions Dict of the top-i items.
+        """
+        self.item_preparation()
+        return computer_users_distribution_by_position(
+            interactions_df=set_df, items_df=self.items_df,
+            distribution=self.dist_name, item_in_memory=self._item_in_memory
+        )
+
     def compute_target_dist(self):
+        """
+        This method computes the target distributions (df_1), which are shared with the other
+        metrics computed over the same users profile, items and distribution.
+        """
         if self.target_dist is None:
-            self.target_dist = self.compute_distribution(self.df_1)
+            self.target_dist = _memo_by_frames(
+                _TARGET_DIST_MEMO, (self.df_1, self.items_df),
+                (_frame_key(self.df_1), _frame_key(self.items_df), self.dist_name),
+                lambda: self.compute_distribution(self.df_1)
+            )
 
     def compute_realized_dist(self):
         if self.realized_dist is None:
             self.realized_dist = self.compute_distribution(self.df_2)
 
+    def compute_target_and_realized_dist(self):
+        """
+        This method computes the missing target and realized distributions.
+        The items classes lookup is built once, before both of them, and used by both.
+        """
+        self.item_preparation()
+        self.compute_target_dist()
+        self.compute_realized_dist()
+
     def compute(self):
         """
 
@@ -2,18 +2,48 @@
 This file contains all evaluation metrics.
 """
 import itertools
-from collections import Counter
+from functools import lru_cache, partial, reduce
+from operator import or_
 from typing import List
 
-from numpy import mean, triu_indices, array, log2, sum
-from pandas import DataFrame, notna
+from numpy import nan, ones, float32, sqrt, log2, asarray, cumsum, arange, float64, \
+    int32, unique, isin, count_nonzero, setdiff1d, ascontiguousarray, uint8, \
+    where, fromiter, bincount, concatenate, zeros, ndarray
+from pandas import DataFrame, Index, Series, factorize
 import scipy.sparse as sp
-from sklearn.metrics.pairwise import cosine_similarity
+from sklearn.preprocessing import normalize
 
 from .base import BaseMetric, BaseCalibrationMetric
 from ..distributions.compute_tilde_q import compute_tilde_q
 from ..models.item import ItemsInMemory
 
+try:
+    from ..measures._ckernels import mean_absolute_error as _c_mean_absolute_error
+except ImportError:
+    _c_mean_absolute_error = None
+
+try:
+    from ._ckernels import average_precision as _c_average_precision, \
+        reciprocal_rank as _c_reciprocal_rank
+except ImportError:
+    _c_average_precision = None
+    _c_reciprocal_rank = None
+
+
+@lru_cache(maxsize=None)
+def _positions(list_size: int):
+    """
+    Function to give the list positions 1..list_size as floats, the precision denominators.
+    The array is shared among the calls, so it is read only.
+
+    :param list_size: The size of the recommendation list.
+
+    :return: A read only Numpy float64 array with the positions.
+    """
+    positions = arange(1, list_size + 1, dtype=float64)
+    positions.flags.writeable = False
+    return positions
+
 
 # ################################################################################################ #
 # ######################################## Accuracy Metrics ###################################### #
@@ -36,23 +66,21 @@ class MeanAveragePrecision(BaseMetric):
         super().__init__(df_1=users_test_set_df, df_2=users_rec_list_df)
 
     @staticmethod
-    def get_list_precision(relevance_array: list) -> float:
+    def get_list_precision(relevance_array) -> float:
         """
         This method is to compute the precision value of one list.
 
-        :param relevance_array: A list with True or False in the positions.
+        :param relevance_array: A list or Numpy array with True or False in the positions.
 
         :return: A float which comprises the metric value from the relevance array.
         """
-        if len(relevance_array) == 0:
+        relevance = asarray(relevance_array, dtype=bool)
+        if _c_average_precision is not None:
+            return _c_average_precision(ascontiguousarray(relevance).view(uint8))
+        if relevance.size == 0:
             return 0.0
-        hit_list = []
-        relevant = 0
-        for i, value in enumerate(relevance_array):
-            if value:
-                relevant += 1
-            hit_list.append(relevant / (i + 1))
-        return mean(hit_list)
+        hits = cumsum(relevance, dtype=int32)
+        return float((hits / _positions(hits.size)).sum() / hits.size)
 
     def single_process(self, tuple_from_df_2: tuple, tuple_from_df_1: tuple) -> float:
         """
@@ -69,6 +97,25 @@ class MeanAveragePrecision(BaseMetric):
             )
         )
 
+    def compute(self) -> float:
+        """
+        This method computes the MAP of all users with vectorized group operations.
+        When all the lists have the same size, a single matrix operation is used.
+
+        :return: A float which comprises the metric value.
+        """
+        self.checking_users()
+        relevance_df = self.get_relevance_df()
+
+        relevance = self.get_relevance_matrix(relevance_df)
+        if relevance is not None:
+            hits = cumsum(relevance, axis=1, dtype=int32)
+            return (hits / _positions(hits.shape[1])).mean(axis=1).mean()
+
+        grouped = relevance_df.groupby(by="USER_ID", sort=False)["RELEVANT"]
+        precision = grouped.cumsum() / (grouped.cumcount() + 1)
+        return precision.groupby(relevance_df["USER_ID"], sort=False).mean().mean()
+
 
 class MeanReciprocalRank(BaseMetric):
     """
@@ -87,21 +134,20 @@ class MeanReciprocalRank(BaseMetric):
         super().__init__(df_1=users_test_set_df, df_2=users_rec_list_df)
 
     @staticmethod
-    def get_list_reciprocal(relevance_array: list) -> float:
+    def get_list_reciprocal(relevance_array) -> float:
         """
         This method is to compute the reciprocal value of one list.
 
-        :param relevance_array: A list with True or False in the positions.
+        :param relevance_array: A list or Numpy array with True or False in the positions.
 
         :return: A float which comprises the metric value from the relevance array.
         """
-        relevance_list_size = len(relevance_array)
-        if relevance_list_size == 0:
+        relevance = asarray(relevance_array, dtype=bool)
+        if _c_reciprocal_rank is not None:
+            return _c_reciprocal_rank(ascontiguousarray(relevance).view(uint8))
+        if relevance.size == 0 or not relevance.any():
             return 0.0
-        for i, value in enumerate(relevance_array):
-            if value:
-                return 1 / (i + 1)
-        return 0.0
+        return 1 / (int(relevance.argmax()) + 1)
 
     def single_process(self, tuple_from_df_2: tuple, tuple_from_df_1: tuple) -> float:
         """
@@ -118,6 +164,28 @@ class MeanReciprocalRank(BaseMetric):
             )
         )
 
+    def compute(self) -> float:
+        """
+        This method computes the MRR of all users with vectorized group operations.
+        Users without relevant items contribute with 0.0.
+        When all the lists have the same size, a single matrix operation is used.
+
+        :return: A float which comprises the metric value.
+        """
+        self.checking_users()
+        relevance_df = self.get_relevance_df()
+
+        relevance = self.get_relevance_matrix(relevance_df)
+        if relevance is not None:
+            first_hit = relevance.argmax(axis=1) + 1
+            return where(relevance.any(axis=1), 1 / first_hit, 0.0).mean()
+
+        position = relevance_df.groupby(by="USER_ID", sort=False).cumcount() + 1
+        first_hit = position[relevance_df["RELEVANT"]].groupby(
+            relevance_df["USER_ID"], sort=False
+        ).min()
+        return (1 / first_hit).sum() / relevance_df["USER_ID"].nunique()
+
 
 # ################################################################################################ #
 # ####################################### Diversity Metrics ###################################### #
@@ -133,31 +201,38 @@ class IntraListSimilarity:
         self.rec_list_df = users_rec_list_df
         self.items = items_df
         self.encoded = encoded_df
+        self._encoded_matrix = None
+        self._encoded_rows = None
 
     def encoding(self):
         if self.encoded is None:
             _items = ItemsInMemory(data=self.items)
             _items.one_hot_encode()
             self.encoded = _items.get_encoded()
+        if self._encoded_matrix is None:
+            # The features are converted and L2 normalized once, without the items with missing
+            # features, and the lists take their rows by position
+            complete = self.encoded.notna().all(axis=1).to_numpy()
+            self._encoded_rows = where(complete, cumsum(complete) - 1, -1)
+            self._encoded_matrix = normalize(sp.csr_matrix(self.encoded.values[complete]))
 
     def compute(self):
-        rec_set = [
-            row["ITEM_ID"].tolist() for ix, row in
-            self.rec_list_df.groupby(by=["USER_ID"])
-        ]
+        rec_set = list(BaseMetric.get_users_items(self.rec_list_df).values())
         self.encoding()
 
-        ils = [self._single_list_similarity(u_rec) for u_rec in rec_set]
-        return mean(ils)
+        ils = fromiter(
+            map(self._single_list_similarity, rec_set), dtype=float64, count=len(rec_set)
+        )
+        return ils.mean()
 
-    def _single_list_similarity(self, predicted: list) -> float:
+    def _single_list_similarity(self, predicted: ndarray) -> float:
         """
         Computes the intra-list similarity for a single list of recommendations.
         Parameters
         ----------
-        predicted : a list
-            Ordered predictions
-            Example: ['X', 'Y', 'Z']
+        predicted : a Numpy array
+            Ordered predictions, as given by get_users_items
+            Example: array(['X', 'Y', 'Z'])
         feature_df: dataframe
             A dataframe with one hot encoded or latent features.
             The dataframe should be indexed by the id used in the recommendations.
@@ -166,19 +241,25 @@ class IntraListSimilarity:
         ils_single_user: float
             The intra-list similarity for a single list of recommendations.
         """
-        # get features for all recommended items
-        recs_content = self.encoded.loc[predicted]
-        recs_content = recs_content.dropna()
-        recs_content = sp.csr_matrix(recs_content.values)
-
-        # calculate similarity scores for all items in list
-        similarity = cosine_similarity(X=recs_content, dense_output=False)
-
-        # get indicies for upper right triangle w/o diagonal
-        upper_right = triu_indices(similarity.shape[0], k=1)
-
-        # calculate average similarity score of all recommended items in list
-        ils_single_user = mean(similarity[upper_right])
+        # get features for all recommended items, without the items with missing features
+        rows = self.encoded.index.get_indexer_for(predicted)
+        if (rows < 0).any():
+            raise KeyError(f"{list(asarray(predicted)[rows < 0])} not in index")
+        rows = self._encoded_rows[rows]
+        recs_content = self._encoded_matrix[rows[rows >= 0]]
+
+        n_items = recs_content.shape[0]
+        if n_items < 2:
+            return nan
+
+        # The rows are already normalized, so the sum of the similarity among all items is the
+        # squared norm of the rows sum, and the diagonal is the sum of the squared rows norms
+        features_sum = asarray(recs_content.sum(axis=0)).ravel()
+        similarity_sum = features_sum @ features_sum
+        diagonal_sum = recs_content.multiply(recs_content).sum()
+
+        # average similarity score of all pairs, the upper right triangle w/o diagonal
+        ils_single_user = (similarity_sum - diagonal_sum) / (n_items * (n_items - 1))
         return ils_single_user
 
 
@@ -202,16 +283,18 @@ class Personalization(BaseMetric):
     def make_rec_matrix(self) -> sp.csr_matrix:
         """
         This method construct the matrix to process the personalization.
-        :return:
-        """
-        predicted = [row["ITEM_ID"].tolist() for ix, row in self.df_2.groupby(by=["USER_ID"])]
-        predicted = array(predicted)
-        df = DataFrame(data=predicted).reset_index().melt(
-            id_vars='index', value_name='item',
+        :return: A sparse matrix with one row per user (sorted ids) and one column per item
+            (sorted ids), with 1 where the item is in the user recommendation list.
+        """
+        user_codes, users = factorize(self.df_2["USER_ID"], sort=True)
+        item_codes, items = factorize(self.df_2["ITEM_ID"], sort=True)
+        rec_matrix = sp.csr_matrix(
+            (ones(len(user_codes), dtype=float32), (user_codes, item_codes)),
+            shape=(len(users), len(items))
         )
-        df = df[['index', 'item']].pivot(index='index', columns='item', values='item')
-        df = notna(df)*1
-        rec_matrix = sp.csr_matrix(df.values)
+        # An item repeated in one list counts once
+        rec_matrix.sum_duplicates()
+        rec_matrix.data[:] = 1
         return rec_matrix
 
     def compute(self):
@@ -223,12 +306,15 @@ class Personalization(BaseMetric):
         # create matrix for recommendations
         rec_matrix_sparse = self.make_rec_matrix()
 
-        # calculate similarity for every user's recommendation list
-        similarity = cosine_similarity(X=rec_matrix_sparse, dense_output=False)
+        # The rows are binary, so their L2 norms are the square roots of the lists sizes.
+        # The sum of the cosine similarity among every pair of lists is the squared norm
+        # of the normalized rows sum, without building the users x users matrix.
+        items_weight = rec_matrix_sparse.T @ (1 / sqrt(rec_matrix_sparse.getnnz(axis=1)))
+        similarity_sum = items_weight @ items_weight
 
         # calculate average similarity
-        dim = similarity.shape[0]
-        personalization = (similarity.sum() - dim) / (dim * (dim - 1))
+        dim = rec_matrix_sparse.shape[0]
+        personalization = (similarity_sum - dim) / (dim * (dim - 1))
         return 1-personalization
 
 
@@ -254,44 +340,75 @@ class Novelty(BaseMetric):
         self.items_df = items_df
 
     @staticmethod
-    def single_process_nov(predicted: List[list], pop: dict, u: int, n: int) -> float:
+    def self_information(items, counts, u: int) -> Series:
         """
-        This method construct the matrix to process the personalization.
-        :return:
+        This method computes the self information -log2(pop / u) of each item once.
+        A zero popularity counts as 0.00001.
+
+        :param items: An iterable with the items ids.
+        :param counts: An iterable with the number of interactions of each item.
+        :param u: The number of users in the profile.
+        :return: A Pandas Series with the self information, indexed by the string items ids.
+        """
+        counts = asarray(counts, dtype=float64)
+        return Series(
+            -log2(where(counts == 0, 0.00001, counts) / u),
+            index=Index(items).astype(str)
+        )
+
+    @staticmethod
+    def items_self_information(self_information: Series, items):
         """
+        This method takes the self information of many items at once, matching the string ids.
 
-        mean_self_information = []
-        k = 0
-        for sublist in predicted:
-            self_information = 0
-            k += 1
+        :param self_information: A Pandas Series given by the self_information method.
+        :param items: An iterable with the items ids.
+        :return: A Numpy float64 array with the self information of each item.
+        """
+        items = Index(items).astype(str)
+        positions = self_information.index.get_indexer(items)
+        if (positions < 0).any():
+            raise KeyError(list(items[positions < 0]))
+        return self_information.to_numpy()[positions]
 
-            for i in sublist:
-                v = pop[str(i)]
-                if v == 0:
-                    v = 0.00001
-                self_information += sum(-log2(v/u))
-            mean_self_information.append(self_information/n)
-        novelty = sum(mean_self_information)/k
-        return novelty
+    @staticmethod
+    def single_process_nov(predicted: List[list], pop: dict, u: int, n: int) -> float:
+        """
+        This method computes the novelty among the users' recommendation lists.
 
-    def compute(self):
+        :param predicted: A list with the users' recommended items ids.
+        :param pop: A Dict with the items ids as keys and the number of interactions as values.
+        :param u: The number of users in the profile.
+        :param n: The size of the recommendation lists.
+        :return: A float which comprises the novelty value.
         """
+        items_information = Novelty.items_self_information(
+            Novelty.self_information(list(pop.keys()), list(pop.values()), u),
+            list(itertools.chain.from_iterable(predicted))
+        )
+        return items_information.sum() / n / len(predicted)
 
-        :return:
+    def compute(self):
         """
+        This method computes the novelty of all users at once. The mean among the users of
+        their lists' mean self information is the sum over all the recommended items, divided
+        by the list size and the number of users.
 
-        rec_set = [row["ITEM_ID"].tolist() for ix, row in self.df_2.groupby(by=["USER_ID"])]
-        pop = dict(Counter(self.df_1["ITEM_ID"].tolist()))
-        item_ids = self.items_df["ITEM_ID"].tolist()
-        diff_ids = set(item_ids) - set(pop.keys())
-        for diff_id in diff_ids:
-            pop[diff_id] = 0
+        :return: A float which comprises the metric value.
+        """
+        # The popularity of the profile items, the other items have no interactions
+        profile_codes, profile_items = factorize(self.df_1["ITEM_ID"], use_na_sentinel=False)
+        pop = bincount(profile_codes, minlength=len(profile_items))
+        other_items = self.items_df["ITEM_ID"].unique()
+        other_items = other_items[~isin(other_items, profile_items)]
         u = self.df_1["USER_ID"].nunique()
 
-        return self.single_process_nov(
-            predicted=rec_set, pop=pop, u=u, n=max(self.df_2["ORDER"])
+        self_information = self.self_information(
+            concatenate((asarray(profile_items), other_items)),
+            concatenate((pop, zeros(len(other_items), dtype=pop.dtype))), u
         )
+        items_information = self.items_self_information(self_information, self.df_2["ITEM_ID"])
+        return items_information.sum() / self.df_2["ORDER"].max() / self.df_2["USER_ID"].nunique()
 
 
 class Coverage(BaseMetric):
@@ -318,12 +435,9 @@ class Coverage(BaseMetric):
 
         :return:
         """
-        predicted = [row["ITEM_ID"].tolist() for ix, row in self.df_2.groupby(by=["USER_ID"])]
-        catalog = self.items_df["ITEM_ID"].tolist()
-
-        predicted_flattened = [p for sublist in predicted for p in sublist]
-        unique_predictions = len(set(predicted_flattened))
-        prediction_coverage = round(unique_predictions/(len(catalog) * 1.0) * 100, 2)
+        # The distinct recommended items, counted over the column without grouping by user
+        unique_predictions = self.df_2["ITEM_ID"].nunique(dropna=False)
+        prediction_coverage = round(unique_predictions/(len(self.items_df) * 1.0) * 100, 2)
 
         return prediction_coverage
 
@@ -351,24 +465,37 @@ class MeanAbsoluteCalibrationError(BaseCalibrationMetric):
         :return:
         """
         p, q = self.transform_to_vec(target_dist, realized_dist)
-        diff_result = [abs(t_value - r_value) for t_value, r_value in zip(p, q)]
-        return mean(diff_result)
+        p, q = asarray(p, dtype=float64), asarray(q, dtype=float64)
+        if _c_mean_absolute_error is not None:
+            return _c_mean_absolute_error(p, q)
+        return abs(p - q).mean()
 
-    def based_on_position(self, rec_pos_df: DataFrame) -> float:
+    def based_on_position(self, rec_pos_df: DataFrame = None, realized_dist: dict = None) -> float:
         """
 
         :param rec_pos_df:
+        :param realized_dist: The users' distributions already computed to the position.
+            If it is None, it is computed from rec_pos_df.
 
         :return:
         """
-        self.realized_dist = self.compute_distribution(rec_pos_df)
-        results = [
-            self.compute_ace(
-                self.target_dist[ix],
-                self.realized_dist[ix],
-            ) for ix in self.users_ix
-        ]
-        return mean(results)
+        if realized_dist is None:
+            realized_dist = self.compute_distribution(rec_pos_df)
+        self.realized_dist = realized_dist
+        return self.compute_ace_batch(self.realized_dist).mean()
+
+    def compute_ace_batch(self, realized_dist: dict):
+        """
+        This method computes the ACE of all users (users_ix) with matrix operations.
+        Each user mean is taken among the genres present in its own distributions,
+        as done by compute_ace.
+
+        :param realized_dist: A Dict with the users' ids as keys and the distributions as values.
+
+        :return: A Numpy array with the ACE of each user, following users_ix.
+        """
+        p, q, presence = self.transform_to_matrix(realized_dist, with_presence=True)
+        return abs(p - q).sum(axis=1) / presence.sum(axis=1)
 
     def compute(self) -> float:
         """
@@ -376,15 +503,14 @@ class MeanAbsoluteCalibrationError(BaseCalibrationMetric):
         :return:
         """
         super().compute()
-        list_size = self.df_2["ORDER"].max()
 
         self.users_ix = list(self.target_dist.keys())
-        results = [
-            self.based_on_position(
-                rec_pos_df=self.df_2[self.df_2["ORDER"] <= i].copy()
-            ) for i in range(1, list_size + 1)
-        ]
-        return mean(results)
+        p, q, presence = self.transform_to_tensor(
+            self.compute_distribution_by_position(self.df_2)
+        )
+        # ACE of each position (axis 0) and user (axis 1), averaged by position
+        positions_ace = abs(q - p).sum(axis=-1) / presence.sum(axis=-1)
+        return positions_ace.mean(axis=1).mean()
 
 
 class Miscalibration(BaseCalibrationMetric):
@@ -396,6 +522,46 @@ class Miscalibration(BaseCalibrationMetric):
 
     """
 
+    @staticmethod
+    def user_miscalibration(calib_measure_func, target_dist: dict, realized_dist: dict) -> float:
+        """
+        This method computes the miscalibration of one user without touching the instance,
+        so the parallel jobs only receive the measure function and the user distributions.
+
+        :param calib_measure_func: The calibration measure function.
+        :param target_dist: A Dict with the genres as keys and the distribution values.
+        :param realized_dist: A Dict with the genres as keys and the distribution values.
+
+        :return: A float which comprises the user miscalibration.
+        """
+        p, q = BaseCalibrationMetric.transform_to_vec(target_dist, realized_dist)
+        return calib_measure_func(
+            p=p,
+            q=compute_tilde_q(p=p, q=q)
+        )
+
+    @staticmethod
+    def user_miscalibration_aligned(
+            calib_measure_func, target_vector: tuple, realized_dist: dict
+    ) -> float:
+        """
+        This method computes the miscalibration of one user from its target vector
+        (get_target_vector), so only the realized distribution is converted.
+
+        :param calib_measure_func: The calibration measure function.
+        :param target_vector: A tuple with the target distribution Dict and its values array.
+        :param realized_dist: A Dict with the genres as keys and the distribution values.
+
+        :return: A float which comprises the user miscalibration.
+        """
+        p, q = BaseCalibrationMetric.align_to_target(target_vector, realized_dist)
+        # The measures guard the zeros with ZeroDivisionError, raised only by Python floats
+        p, q = p.tolist(), q.tolist()
+        return calib_measure_func(
+            p=p,
+            q=compute_tilde_q(p=p, q=q)
+        )
+
     def compute_miscalibration(self, target_dist: dict, realized_dist: dict) -> float:
         """
 
@@ -404,40 +570,53 @@ class Miscalibration(BaseCalibrationMetric):
 
         :return:
         """
-        p, q = self.transform_to_vec(target_dist, realized_dist)
-        return self.calib_measure_func(
-            p=p,
-            q=compute_tilde_q(p=p, q=q)
+        return self.user_miscalibration(self.calib_measure_func, target_dist, realized_dist)
+
+    def map_users_miscalibration(self, distri: dict) -> list:
+        """
+        This method computes the miscalibration of each user (users_ix order),
+        in parallel when n_jobs is not 1.
+
+        :param distri: A Dict with the users' ids as keys and the realized distributions.
+
+        :return: A list with the users' miscalibration.
+        """
+        return self.map_users(
+            partial(self.user_miscalibration_aligned, self.calib_measure_func),
+            [self.get_target_vector(ix) for ix in self.users_ix],
+            [distri[ix] for ix in self.users_ix]
         )
 
+    def users_miscalibration(self, distri: dict):
+        """
+        This method computes the miscalibration of each user (users_ix order) as a Numpy array,
+        with one vectorized call when the distance measure allows it.
+
+        :param distri: A Dict with the users' ids as keys and the realized distributions.
+
+        :return: A Numpy float64 array with the users' miscalibration.
+        """
+        if self.calib_measure_batch_func is not None:
+            return self.users_miscalibration_batch(distri)
+        return asarray(self.map_users_miscalibration(distri), dtype=float64)
+
     def user_association_miscalibration(self, distri: dict):
-        return {
-            ix: self.compute_miscalibration(
-                self.target_dist[ix],
-                distri[ix]
-            )
-            for ix in self.users_ix
-        }
+        return dict(zip(self.users_ix, self.users_miscalibration(distri).tolist()))
 
     def compute(self) -> float:
         """
 
         :return:
         """
-        super().compute()
-        self.compute_realized_dist()
+        self.checking_users()
+        self.compute_target_and_realized_dist()
 
         self.users_ix = list(self.target_dist.keys())
 
-        results = [
-            self.compute_miscalibration(
-                self.target_dist[ix],
-                self.realized_dist[ix]
-            )
-            for ix in self.users_ix
-        ]
+        if self.calib_measure_batch_func is not None:
+            return self.compute_batch()
 
-        return mean(results)
+        return self.mean_of(self.map_users_miscalibration(self.realized_dist))
 
 
 class MeanAverageMiscalibration(Miscalibration):
@@ -449,37 +628,36 @@ class MeanAverageMiscalibration(Miscalibration):
 
     """
 
-    def based_on_position(self, rec_pos_df: DataFrame) -> float:
+    def based_on_position(self, rec_pos_df: DataFrame = None, realized_dist: dict = None) -> float:
         """
 
         :param rec_pos_df:
+        :param realized_dist: The users' distributions already computed to the position.
+            If it is None, it is computed from rec_pos_df.
 
         :return:
         """
-        self.realized_dist = self.compute_distribution(rec_pos_df)
-        results = [
-            self.compute_miscalibration(
-                self.target_dist[ix],
-                self.realized_dist[ix],
-            ) for ix in self.users_ix
-        ]
-        return mean(results)
+        if realized_dist is None:
+            realized_dist = self.compute_distribution(rec_pos_df)
+        self.realized_dist = realized_dist
+        if self.calib_measure_batch_func is not None:
+            return self.compute_batch()
+        return self.mean_of(self.map_users_miscalibration(self.realized_dist))
 
     def compute(self) -> float:
         """
 
         :return: A float which comprises the metric value.
         """
-        super().compute()
-        list_size = self.df_2["ORDER"].max()
+        self.checking_users()
+        self.compute_target_dist()
 
         self.users_ix = list(self.target_dist.keys())
         results = [
-            self.based_on_position(
-                rec_pos_df=self.df_2[self.df_2["ORDER"] <= i].copy()
-            ) for i in range(1, list_size + 1)
+            self.based_on_position(realized_dist=realized_dist)
+            for realized_dist in self.compute_distribution_by_position(self.df_2)
         ]
-        return mean(results)
+        return self.mean_of(results)
 
 
 class NumberOfUserIncreaseAndDecreaseMiscalibration(Miscalibration):
@@ -516,30 +694,33 @@ class NumberOfUserIncreaseAndDecreaseMiscalibration(Miscalibration):
     def set_comparison(self, choice: bool) -> None:
         self.with_profile = choice
 
-    def selecting_users(self) -> list:
-        rec_miscalib = self.user_association_miscalibration(
-            self.realized_dist
-        )
-        base_miscalib = self.user_association_miscalibration(
-            self.distri_df_3
-        )
+    def selecting_mask(self) -> tuple:
+        """
+        This method flags the users whose recommendation miscalibration increased
+        (or decreased, see set_choice) in comparison to the baseline miscalibration.
+
+        :return: A tuple with the Numpy array of the users' recommendation miscalibration
+            and the boolean mask of the selected users, both following users_ix.
+        """
+        rec_miscalib = self.users_miscalibration(self.realized_dist)
+        base_miscalib = self.users_miscalibration(self.distri_df_3)
         if self.increase:
-            return [
-                rec_miscalib[ix]
-                for ix in self.users_ix
-                if rec_miscalib[ix] >= base_miscalib[ix]
-            ]
-        else:
-            return [
-                rec_miscalib[ix]
-                for ix in self.users_ix
-                if rec_miscalib[ix] < base_miscalib[ix]
-            ]
+            return rec_miscalib, rec_miscalib >= base_miscalib
+        return rec_miscalib, rec_miscalib < base_miscalib
+
+    def selecting_users(self):
+        """
+        This method selects the users' recommendation miscalibration that increased
+        (or decreased, see set_choice) in comparison to the baseline miscalibration.
+
+        :return: A Numpy array with the selected users' miscalibration, following users_ix.
+        """
+        rec_miscalib, selected = self.selecting_mask()
+        return rec_miscalib[selected]
 
     def base_dist_compute(self):
         self.checking_users()
-        self.compute_target_dist()
-        self.compute_realized_dist()
+        self.compute_target_and_realized_dist()
         self.distri_df_3 = self.compute_distribution(self.df_3)
         self.users_ix = list(self.target_dist.keys())
 
@@ -550,7 +731,7 @@ class NumberOfUserIncreaseAndDecreaseMiscalibration(Miscalibration):
         """
         self.base_dist_compute()
 
-        return len(self.selecting_users())
+        return int(count_nonzero(self.selecting_mask()[1]))
 
 
 class UserIDMiscalibration(NumberOfUserIncreaseAndDecreaseMiscalibration):
@@ -572,7 +753,7 @@ class UserIDMiscalibration(NumberOfUserIncreaseAndDecreaseMiscalibration):
         """
         self.base_dist_compute()
 
-        return mean(self.selecting_values())
+        return self.mean_of(self.selecting_values())
 
 
 # ################################################################################################ #
@@ -613,19 +794,21 @@ class Serendipity(BaseMetric):
         :return: A float which comprises the metric (serendipity) value for one user.
         """
 
-        rec_items_ids = tuple_from_df_2[1]['ITEM_ID'].tolist()
-        test_items_ids = tuple_from_df_1[1]['ITEM_ID'].tolist()
-        baselines_items_ids = tuple_from_df_3[1]['ITEM_ID'].tolist()
-
-        useful = list(set(rec_items_ids) & set(test_items_ids))
+        rec_items_ids = tuple_from_df_2[1]['ITEM_ID'].to_numpy()
+        test_items_ids = tuple_from_df_1[1]['ITEM_ID'].to_numpy()
+        baselines_items_ids = tuple_from_df_3[1]['ITEM_ID'].to_numpy()
 
-        unexpected_ids = list(set(rec_items_ids) - set(baselines_items_ids))
-
-        sen = list(set(unexpected_ids) & set(useful))
+        # Useful (in the test set) and unexpected (out of the baseline) distinct items
+        distinct_rec_ids = unique(rec_items_ids)
+        useful = isin(distinct_rec_ids, test_items_ids)
+        if not useful.any():
+            return 0.0
+        sen = useful & ~isin(distinct_rec_ids, baselines_items_ids)
+        n_sen = count_nonzero(sen)
 
-        n_unexpected = 0
-        if len(sen) > 0 and len(rec_items_ids) > 0:
-            n_unexpected = len(sen) / len(rec_items_ids)
+        n_unexpected = 0.0
+        if n_sen > 0 and len(rec_items_ids) > 0:
+            n_unexpected = n_sen / len(rec_items_ids)
         return n_unexpected
 
     def compute(self) -> float:
@@ -634,15 +817,17 @@ class Serendipity(BaseMetric):
         :return: A float which comprises the metric value.
         """
         self.checking_users()
-        self.ordering_and_grouping()
 
-        users_results = list(map(
-            self.single_process_serend,
-            self.grouped_df_3,
-            self.grouped_df_2,
-            self.grouped_df_1
-        ))
-        return mean(users_results)
+        rec_keys, test_keys, baseline_keys = self.encode_pairs(self.df_2, self.df_1, self.df_3)
+        rec_keys = Series(rec_keys, index=self.df_2.index)
+        # Distinct recommended items which are useful (test) and unexpected (out of baseline)
+        useful = rec_keys.isin(test_keys)
+        if len(useful) > 0 and not useful.any():
+            return 0.0
+        serendipitous = useful & ~rec_keys.isin(baseline_keys) & ~rec_keys.duplicated()
+
+        grouped = serendipitous.groupby(self.df_2["USER_ID"])
+        return (grouped.sum() / grouped.size()).mean()
 
 
 class Unexpectedness(BaseMetric):
@@ -670,13 +855,28 @@ class Unexpectedness(BaseMetric):
 
         :return: A float which comprises the metric (unexpectedness) value for one user.
         """
-        rec_items_ids = tuple_from_df_2[1]['ITEM_ID'].tolist()
-        test_items_ids = tuple_from_df_1[1]['ITEM_ID'].tolist()
+        rec_items_ids = tuple_from_df_2[1]['ITEM_ID'].to_numpy()
+        test_items_ids = tuple_from_df_1[1]['ITEM_ID'].to_numpy()
 
-        unexpected_ids = list(set(rec_items_ids) - set(test_items_ids))
-        n_unexpected = len(unexpected_ids) / len(rec_items_ids)
+        unexpected = ~isin(unique(rec_items_ids), test_items_ids)
+        n_unexpected = count_nonzero(unexpected) / len(rec_items_ids)
         return n_unexpected
 
+    def compute(self) -> float:
+        """
+
+        :return: A float which comprises the metric value.
+        """
+        self.checking_users()
+
+        rec_keys, test_keys = self.encode_pairs(self.df_2, self.df_1)
+        rec_keys = Series(rec_keys, index=self.df_2.index)
+        # Distinct recommended items which are out of the test set
+        unexpected = ~rec_keys.isin(test_keys) & ~rec_keys.duplicated()
+
+        grouped = unexpected.groupby(self.df_2["USER_ID"])
+        return (grouped.sum() / grouped.size()).mean()
+
 
 # ################################################################################################ #
 # ###################################### Verification Metrics #################################### #
@@ -702,10 +902,7 @@ class AverageNumberOfOItemsChanges(BaseMetric):
         This method is to order the Dataframe based on the user ids.
         In special, this method overrides the original one, including one more attribute to order.
         """
-        self.df_1.sort_values(
-            by=['USER_ID', 'ORDER'], inplace=True
-        )
-        self.df_2.sort_values(by=['USER_ID', 'ORDER'], inplace=True)
+        self.order_by(['USER_ID', 'ORDER'], 1, 2)
 
     def single_process(self, tuple_from_df_2: tuple, tuple_from_df_1: tuple) -> float:
         """
@@ -716,10 +913,36 @@ class AverageNumberOfOItemsChanges(BaseMetric):
 
         :return: A float which comprises the metric (ANIC) value for one user.
         """
-        set_a = tuple_from_df_1[1]["ITEM_ID"].tolist()
-        set_b = tuple_from_df_2[1]["ITEM_ID"].tolist()
-        size = len(set(set_b) - set(set_a))
-        return size
+        return self.items_changes(
+            tuple_from_df_2[1]["ITEM_ID"].to_numpy(), tuple_from_df_1[1]["ITEM_ID"].to_numpy()
+        )
+
+    @staticmethod
+    def items_changes(rec_items, baseline_items) -> int:
+        """
+        This method counts the recommended items that are not in the baseline list.
+
+        :param rec_items: A Numpy array with the user recommended items ids.
+        :param baseline_items: A Numpy array with the user baseline items ids.
+
+        :return: An int which comprises the metric (ANIC) value for one user.
+        """
+        return len(setdiff1d(rec_items, baseline_items))
+
+    def compute(self) -> float:
+        """
+        This method computes the ANIC of all users at once, over the encoded (user, item) pairs.
+        The lists are compared as sets, so the Dataframes are not ordered.
+
+        :return: A float which comprises the metric value.
+        """
+        self.checking_users()
+        rec_keys, baseline_keys = self.encode_pairs(self.df_2, self.df_1)
+        rec_keys = Series(rec_keys, index=self.df_2.index)
+        # Distinct recommended items which are out of the baseline list
+        changed = ~rec_keys.isin(baseline_keys) & ~rec_keys.duplicated()
+
+        return changed.groupby(self.df_2["USER_ID"]).sum().mean()
 
 
 class AverageNumberOfGenreChanges(BaseMetric):
@@ -740,16 +963,31 @@ class AverageNumberOfGenreChanges(BaseMetric):
         """
         super().__init__(df_1=users_baseline_df, df_2=users_rec_list_df)
         self.items_df = items_df
+        self._item_genres = None
+
+    def item_genres(self) -> dict:
+        """
+        This method maps each item to its genres set as a bitmask, one bit per genre,
+        splitting the GENRES column once.
+
+        :return: A Dict with the items ids as keys and ints with the genres bits as values.
+        """
+        if self._item_genres is None:
+            items_genres = self.items_df["GENRES"].str.split("|")
+            genres = dict.fromkeys(itertools.chain.from_iterable(items_genres))
+            genre_bit = {genre: 1 << bit for bit, genre in enumerate(genres)}
+            self._item_genres = dict(zip(
+                self.items_df["ITEM_ID"].to_numpy(),
+                (reduce(or_, map(genre_bit.get, genres), 0) for genres in items_genres)
+            ))
+        return self._item_genres
 
     def ordering(self) -> None:
         """
         This method is to order the Dataframe based on the user ids.
         In special, this method overrides the original one, including one more attribute to order.
         """
-        self.df_1.sort_values(
-            by=['USER_ID', 'ORDER'], inplace=True
-        )
-        self.df_2.sort_values(by=['USER_ID', 'ORDER'], inplace=True)
+        self.order_by(['USER_ID', 'ORDER'], 1, 2)
 
     def single_process(self, tuple_from_df_2: tuple, tuple_from_df_1: tuple) -> float:
         """
@@ -760,18 +998,49 @@ class AverageNumberOfGenreChanges(BaseMetric):
 
         :return: A float which comprises the metric (ANGC) value for one user.
         """
+        return self.genres_changes(
+            self.item_genres(),
+            tuple_from_df_2[1]["ITEM_ID"].to_numpy(), tuple_from_df_1[1]["ITEM_ID"].to_numpy()
+        )
+
+    @staticmethod
+    def genres_changes(item_genres: dict, rec_items, baseline_items) -> int:
+        """
+        This method counts the recommended genres that are not in the baseline list,
+        without touching the instance, so the parallel jobs only receive the items genres.
 
-        set_a = tuple_from_df_1[1]["ITEM_ID"].tolist()
-        set_b = tuple_from_df_2[1]["ITEM_ID"].tolist()
+        :param item_genres: A Dict with the items genres bitmasks, given by item_genres.
+        :param rec_items: A Numpy array with the user recommended items ids.
+        :param baseline_items: A Numpy array with the user baseline items ids.
 
-        genres_a = list(itertools.chain.from_iterable([
-            genres.split("|")
-            for genres in self.items_df[self.items_df["ITEM_ID"].isin(set_a)]["GENRES"].tolist()
-        ]))
-        genres_b = list(itertools.chain.from_iterable([
-            genres.split("|")
-            for genres in self.items_df[self.items_df["ITEM_ID"].isin(set_b)]["GENRES"].tolist()
-        ]))
+        :return: An int which comprises the metric (ANGC) value for one user.
+        """
+        # Items out of the items set have no genres
+        genres_a = reduce(or_, (item_genres.get(item, 0) for item in baseline_items), 0)
+        genres_b = reduce(or_, (item_genres.get(item, 0) for item in rec_items), 0)
 
-        size = len(set(genres_b) - set(genres_a))
+        size = bin(genres_b & ~genres_a).count("1")
         return size
+
+    def compute(self) -> float:
+        """
+        This method computes the ANGC of all users over the users' items ids arrays.
+        The lists are compared as sets, so the Dataframes are not ordered.
+
+        :return: A float which comprises the metric value.
+        """
+        self.checking_users()
+        rec_items = self.get_users_items(self.df_2)
+        baseline_items = self.get_users_items(self.df_1)
+        users_ids = list(rec_items)
+        if self.users_ids_as_str(self.df_1["USER_ID"], self.df_2["USER_ID"]):
+            # The users ids only match as strings, as done by checking_users
+            baseline_items = {str(user_id): items for user_id, items in baseline_items.items()}
+            users_ids = [str(user_id) for user_id in users_ids]
+
+        users_results = self.map_users(
+            partial(self.genres_changes, self.item_genres()),
+            rec_items.values(),
+            [baseline_items[user_id] for user_id in users_ids]
+        )
+        return self.mean_of(users_results)
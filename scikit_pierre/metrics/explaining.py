@@ -1,5 +1,6 @@
 import itertools
 
+from numpy import argmin, flatnonzero, float64, fromiter, setdiff1d
 from pandas import DataFrame
 
 from scikit_pierre.distributions.compute_tilde_q import compute_tilde_q
@@ -34,19 +35,35 @@ class ExplainingMiscalibration(BaseCalibrationMetric):
             distance_func_name=distance_func_name
         )
         self.df_3 = users_baseline_df
+        self.target_dist = None
         self.distri_df_3 = None
+        self._users_rows = {}
 
     def ordering(self) -> None:
         """
         This method is to order the Dataframe based on the user ids.
         In special, this method overrides the original one, including one more attribute to order.
         """
-        self.df_3.sort_values(
-            by=['USER_ID', 'ORDER'], inplace=True
-        )
-        self.df_2.sort_values(
-            by=['USER_ID', 'ORDER'], inplace=True
-        )
+        self.order_by(['USER_ID', 'ORDER'], 3, 2)
+
+    def user_rows(self, number: int, user_id: str) -> DataFrame:
+        """
+        This method gives the rows of one user from a Dataframe (df_2 or df_3), looking up
+        the positions of a single groupby over the Dataframe instead of scanning it per user.
+
+        :param number: The number of the Dataframe, e.g. 2 or 3.
+        :param user_id: The user id, as string.
+        :return: A Pandas DataFrame with the user rows, which is empty for unknown users.
+        """
+        df = getattr(self, f"df_{number}")
+        df_and_rows = self._users_rows.get(number)
+        if df_and_rows is None or df_and_rows[0] is not df:
+            df_and_rows = (df, df.groupby(by="USER_ID", sort=False).indices)
+            self._users_rows[number] = df_and_rows
+        rows = df_and_rows[1].get(int(user_id))
+        if rows is None:
+            return df.iloc[:0]
+        return df.iloc[rows]
 
     @staticmethod
     def single_process_anic(tuple_from_df_2: tuple, tuple_from_df_3: tuple) -> float:
@@ -58,9 +75,9 @@ class ExplainingMiscalibration(BaseCalibrationMetric):
 
         :return: A float which comprises the metric (ANIC) value for one user.
         """
-        set_a = tuple_from_df_3[1]["ITEM_ID"].tolist()
-        set_b = tuple_from_df_2[1]["ITEM_ID"].tolist()
-        size = len(set(set_b) - set(set_a))
+        set_a = tuple_from_df_3[1]["ITEM_ID"].to_numpy()
+        set_b = tuple_from_df_2[1]["ITEM_ID"].to_numpy()
+        size = len(setdiff1d(set_b, set_a))
         return size
 
     def find_user_based_on_changes(self) -> dict:
@@ -95,9 +112,9 @@ class ExplainingMiscalibration(BaseCalibrationMetric):
 
     def user_association_miscalibration(self, distri: dict):
         return {
-            str(ix): self.compute_miscalibration(
-                self.target_dist[str(ix)],
-                distri[str(ix)]
+            ix: self.compute_miscalibration(
+                self.target_dist[ix],
+                distri[ix]
             )
             for ix in self.users_ix
         }
@@ -110,75 +127,56 @@ class ExplainingMiscalibration(BaseCalibrationMetric):
         super().compute()
         self.ordering_and_grouping()
 
+        # The users' ids are cast to string once, all lookups below use them directly
+        self.target_dist = self.str_keys(self.target_dist)
         self.users_ix = list(self.target_dist.keys())
 
-        self.realized_dist = self.compute_distribution(self.df_2)
+        self.realized_dist = self.str_keys(self.compute_distribution(self.df_2))
         mis_2_results = self.user_association_miscalibration(
             distri=self.realized_dist
         )
 
-        self.distri_df_3 = self.compute_distribution(self.df_3)
+        self.distri_df_3 = self.str_keys(self.compute_distribution(self.df_3))
         mis_3_results = self.user_association_miscalibration(
             distri=self.distri_df_3
         )
 
         anic_results = self.find_user_based_on_changes()
 
-        _min_value = min(anic_results.values())
-        _max_value = max(anic_results.values())
-
-        _min_changes_high = []
-        _max_changes_high = []
-
-        _min_changes_lower = []
-        _max_changes_lower = []
-
-        _min_calib = []
-        _max_calib = []
-
-        _aux_min = 1000
-        _aux_id_min = 1000
-        _aux_max = 0
-        _aux_id_max = 0
-        for _ix in anic_results.keys():
-            if mis_2_results[str(_ix)] < _aux_min:
-                _aux_min = mis_2_results[str(_ix)]
-                _aux_id_min = str(_ix)
-
-            if mis_2_results[str(_ix)] > _aux_max:
-                _aux_max = mis_2_results[str(_ix)]
-                _aux_id_max = str(_ix)
-
-            if (anic_results[str(_ix)] == _min_value and
-                    mis_2_results[str(_ix)] > mis_3_results[str(_ix)]):
-                _min_changes_high.append(str(_ix))
-
-            if (anic_results[str(_ix)] == _max_value and
-                    mis_2_results[str(_ix)] > mis_3_results[str(_ix)]):
-                _max_changes_high.append(str(_ix))
+        # Parallel arrays following the ANIC users, compared with vectorized masks
+        users_ix = list(anic_results.keys())
+        anic_values = fromiter(anic_results.values(), dtype=float64, count=len(users_ix))
+        mis_2_values = fromiter(
+            (mis_2_results[_ix] for _ix in users_ix), dtype=float64, count=len(users_ix)
+        )
+        mis_3_values = fromiter(
+            (mis_3_results[_ix] for _ix in users_ix), dtype=float64, count=len(users_ix)
+        )
 
-            if (anic_results[str(_ix)] == _min_value and
-                    mis_2_results[str(_ix)] < mis_3_results[str(_ix)]):
-                _min_changes_lower.append(str(_ix))
+        _aux_id_min = users_ix[int(argmin(mis_2_values))]
 
-            if (anic_results[str(_ix)] == _max_value and
-                    mis_2_results[str(_ix)] < mis_3_results[str(_ix)]):
-                _max_changes_lower.append(str(_ix))
+        min_changes = anic_values == anic_values.min()
+        _min_changes_high = [
+            users_ix[i] for i in flatnonzero(min_changes & (mis_2_values > mis_3_values))
+        ]
+        _min_changes_lower = [
+            users_ix[i] for i in flatnonzero(min_changes & (mis_2_values < mis_3_values))
+        ]
 
         if len(_min_changes_lower) > 0:
             self.user_explain_history(user_id=_aux_id_min)
             self.printing_list_changing(
                 user_id=_min_changes_lower[0],
-                calib_base=mis_3_results[str(_min_changes_lower[0])],
-                calib_rec=mis_2_results[str(_min_changes_lower[0])]
+                calib_base=mis_3_results[_min_changes_lower[0]],
+                calib_rec=mis_2_results[_min_changes_lower[0]]
             )
         #
         if len(_min_changes_high) > 0:
             self.user_explain_history(user_id=_min_changes_high[0])
             self.printing_list_changing(
                 user_id=_min_changes_high[0],
-                calib_base=mis_3_results[str(_min_changes_high[0])],
-                calib_rec=mis_2_results[str(_min_changes_high[0])]
+                calib_base=mis_3_results[_min_changes_high[0]],
+                calib_rec=mis_2_results[_min_changes_high[0]]
             )
 
         # self.printing_list_changing(
@@ -196,11 +194,11 @@ class ExplainingMiscalibration(BaseCalibrationMetric):
         return 0.0
 
     def printing_list_changing(self, user_id: str, calib_base, calib_rec):
-        user_rec_ids = self.df_2[self.df_2["USER_ID"] == int(user_id)]["ITEM_ID"].tolist()
-        user_base_ids = self.df_3[self.df_3["USER_ID"] == int(user_id)]["ITEM_ID"].tolist()
+        user_rec_ids = self.user_rows(2, user_id)["ITEM_ID"].to_numpy()
+        user_base_ids = self.user_rows(3, user_id)["ITEM_ID"].to_numpy()
 
-        rec_changed = list(set(user_rec_ids) - set(user_base_ids))
-        base_changed = list(set(user_base_ids) - set(user_rec_ids))
+        rec_changed = setdiff1d(user_rec_ids, user_base_ids)
+        base_changed = setdiff1d(user_base_ids, user_rec_ids)
 
         rec_list = self.items_df[self.items_df["ITEM_ID"].isin(rec_changed)]
         base_list = self.items_df[self.items_df["ITEM_ID"].isin(base_changed)]
@@ -251,11 +249,11 @@ class ExplainingMiscalibration(BaseCalibrationMetric):
         print("Genres excluded from the recommendation list: ", len(base_genres))
         print(base_genres)
 
-    def user_explain_history(self, user_id):
+    def user_explain_history(self, user_id: str):
         cut_value = self.df_2["ORDER"].max()
 
-        base_list = self.df_3[self.df_3["USER_ID"] == int(user_id)].iloc[:cut_value].copy()
-        rec_list = self.df_2[self.df_2["USER_ID"] == int(user_id)]
+        base_list = self.user_rows(3, user_id).iloc[:cut_value]
+        rec_list = self.user_rows(2, user_id)
 
         for base_item, rec_item in zip(base_list.itertuples(), rec_list.itertuples()):
             print("-" * 100)
@@ -270,16 +268,16 @@ class ExplainingMiscalibration(BaseCalibrationMetric):
             print(f"- - The position {p} had the item changed: ")
             print(str(getattr(base_item, "ITEM_ID")), " - ", str(getattr(rec_item, "ITEM_ID")))
 
-            base_dist = self.compute_distribution(base_list.head(int(p)).copy())
+            base_dist = self.str_keys(self.compute_distribution(base_list.head(int(p))))
             calib_base = self.compute_miscalibration(
-                self.target_dist[str(user_id)],
-                base_dist[str(user_id)]
+                self.target_dist[user_id],
+                base_dist[user_id]
             )
 
-            realized_dist = self.compute_distribution(rec_list.head(int(p)).copy())
+            realized_dist = self.str_keys(self.compute_distribution(rec_list.head(int(p))))
             calib_rec = self.compute_miscalibration(
-                self.target_dist[str(user_id)],
-                realized_dist[str(user_id)]
+                self.target_dist[user_id],
+                realized_dist[user_id]
             )
 
             print(f"- - The miscalibration goes from {calib_base} To {calib_rec}")
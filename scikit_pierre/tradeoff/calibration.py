@@ -7,7 +7,7 @@ from copy import deepcopy
 from math import log
 import numpy as np
 from numpy import sign
-from pandas import DataFrame, concat, merge
+from pandas import DataFrame, merge
 
 from .basetradeoff import BaseTradeOff
 from ..distributions.accessible import distributions_funcs
@@ -91,6 +91,8 @@ class LinearCalibration(CalibrationBase):
         self._tradeoff_weight_component = None
         self._select_item_component = None
         self._tradeoff_balance_component = None
+        # Pre-computed target distributions, one Dict per user
+        self._users_target_dist = None
 
     def config(self, distribution_component: str = "CWS",
                fairness_component: str = "CHI", relevance_component: str = "SUM",
@@ -140,6 +142,16 @@ class LinearCalibration(CalibrationBase):
 
         self._item_in_memory.item_by_genre()
 
+        if self.users_distribution is not None:
+            columns = self.users_distribution.columns.tolist()
+            self._users_target_dist = {
+                uid: dict(zip(columns, values))
+                for uid, values in zip(
+                    self.users_distribution.index.tolist(),
+                    self.users_distribution.to_numpy().tolist()
+                )
+            }
+
         if not uuids:
             uuids = self.users_preferences['USER_ID'].unique().tolist()
 
@@ -153,14 +165,11 @@ class LinearCalibration(CalibrationBase):
         # Target Distribution (p)
 
         target_dist = {}
-        if self.users_distribution is None:
+        if self._users_target_dist is None:
             target_dist = self._distribution_component(
                 items=self._item_in_memory.select_user_items(data=user_pref))
         else:
-            pre_computed_distribution = self.users_distribution.loc[uid]
-            target_dist = {
-                col: value for col, value in zip(self.users_distribution.columns.tolist(),
-                                                 pre_computed_distribution.values.tolist())}
+            target_dist = self._users_target_dist[uid]
 
         # Tradeoff weight (lambda)
         if self.environment['weight'][:2] == "C@":
@@ -395,20 +404,13 @@ class LogarithmBias(CalibrationBase):
         return rec_list
 
     def _computing_item_bias(self, users_preferences):
-        bias_df = deepcopy(users_preferences)
-        items_id_list = bias_df['ITEM_ID'].unique().tolist()
-        bias_df['TRANSACTION_VALUE'] -= self.transaction_mean
-        item_bias_df = DataFrame()
-        for item_id in items_id_list:
-            item_subset_df = bias_df[bias_df['ITEM_ID'] == item_id]
-            numerator = item_subset_df['TRANSACTION_VALUE'].sum()
-            denominator = LogarithmBias.BIAS_ALPHA + len(item_subset_df)
-            item_bias_df = concat([
-                item_bias_df, DataFrame(
-                    data=[[item_id, numerator / denominator]],
-                    columns=['ITEM_ID', 'BIAS_VALUE']
-                )
-            ])
+        centered = users_preferences['TRANSACTION_VALUE'] - self.transaction_mean
+        # Sum and count of each item, in a single pass over the preferences
+        grouped = centered.groupby(users_preferences['ITEM_ID'], sort=False).agg(['sum', 'size'])
+        item_bias_df = DataFrame({
+            'ITEM_ID': grouped.index.to_numpy(),
+            'BIAS_VALUE': (grouped['sum'] / (LogarithmBias.BIAS_ALPHA + grouped['size'])).to_numpy()
+        })
         return item_bias_df
 
     def _computing_user_bias(self, user_item_list, user_bias_list, i_id):
@@ -38,6 +38,7 @@ cmdclass = {}
 
 # ext = ".pyx" if USE_CYTHON else ".c"
 EXT = ".py" if USE_CYTHON else ".c"
+PYX_EXT = ".pyx" if USE_CYTHON else ".c"
 
 extensions = [
     Extension(
@@ -55,6 +56,18 @@ extensions = [
         sources=["scikit_pierre/metrics/evaluation" + EXT],
         include_dirs=[np.get_include()]
     ),
+    Extension(
+        name="scikit_pierre.measures._ckernels",
+        sources=["scikit_pierre/measures/_ckernels" + PYX_EXT],
+        include_dirs=[np.get_include()],
+        extra_compile_args=["-O3"]
+    ),
+    Extension(
+        name="scikit_pierre.metrics._ckernels",
+        sources=["scikit_pierre/metrics/_ckernels" + PYX_EXT],
+        include_dirs=[np.get_include()],
+        extra_compile_args=["-O3"]
+    ),
 ]
 
 EXCLUDE_FILES = [
@@ -5,6 +5,8 @@ Unit Test Case to the Chi Family measure.
 import unittest
 from math import sqrt
 
+import numpy as np
+
 from ....scikit_pierre.measures import chi
 
 
@@ -123,3 +125,17 @@ class TestChi(unittest.TestCase):
             chi.additive_symmetric_chi_squared(p=[0.389, 0.5, 0.25, 0.625, 0.0, 0.0, 0.25],
                                                q=[0.35, 0.563, 0.4, 0.5, 0.0, 0.0, 0.0]),
             answer_num)
+
+    def test_squared_euclidean_batch(self):
+        p = [[0.389, 0.5, 0.25, 0.625, 0.0, 0.0, 0.25], [0.2, 0.3, 0.0, 0.5, 0.0, 0.0, 0.0]]
+        q = [[0.35, 0.563, 0.4, 0.5, 0.0, 0.0, 0.0], [0.2, 0.1, 0.3, 0.4, 0.0, 0.0, 0.0]]
+        answer = chi.squared_euclidean_batch(p=np.array(p), q=np.array(q))
+        for row, (p_row, q_row) in enumerate(zip(p, q)):
+            self.assertAlmostEqual(answer[row], chi.squared_euclidean(p=p_row, q=q_row))
+
+    def test_person_chi_square_batch(self):
+        p = [[0.389, 0.5, 0.25, 0.625, 0.0, 0.0, 0.25], [0.2, 0.3, 0.0, 0.5, 0.0, 0.0, 0.0]]
+        q = [[0.35, 0.563, 0.4, 0.5, 0.0, 0.0, 0.0], [0.2, 0.1, 0.3, 0.4, 0.0, 0.0, 0.0]]
+        answer = chi.person_chi_square_batch(p=np.array(p), q=np.array(q))
+        for row, (p_row, q_row) in enumerate(zip(p, q)):
+            self.assertAlmostEqual(answer[row], chi.person_chi_square(p=p_row, q=q_row))
@@ -1,6 +1,8 @@
 import unittest
 from math import sqrt, log
 
+import numpy as np
+
 from ....scikit_pierre.measures import fidelity
 
 
@@ -62,3 +64,10 @@ class TestFidelity(unittest.TestCase):
             fidelity.squared_chord_divergence(p=[0.389, 0.5, 0.25, 0.625, 0.0, 0.0, 0.25],
                                               q=[0.35, 0.563, 0.4, 0.5, 0.0, 0.0, 0.0]),
             answer)
+
+    def test_hellinger_batch(self):
+        p = [[0.389, 0.5, 0.25, 0.625, 0.0, 0.0, 0.25], [0.2, 0.3, 0.0, 0.5, 0.0, 0.0, 0.0]]
+        q = [[0.35, 0.563, 0.4, 0.5, 0.0, 0.0, 0.0], [0.2, 0.1, 0.3, 0.4, 0.0, 0.0, 0.0]]
+        answer = fidelity.hellinger_batch(p=np.array(p), q=np.array(q))
+        for row, (p_row, q_row) in enumerate(zip(p, q)):
+            self.assertAlmostEqual(answer[row], fidelity.hellinger(p=p_row, q=q_row))
@@ -1,6 +1,8 @@
 import unittest
 from math import log
 
+import numpy as np
+
 from ....scikit_pierre.measures import shannon
 
 
@@ -98,3 +100,25 @@ class TestShanon(unittest.TestCase):
         self.assertEqual(shannon.jensen_difference(p=[0.389, 0.5, 0.25, 0.625, 0.0, 0.0, 0.25],
                                                    q=[0.35, 0.563, 0.4, 0.5, 0.0, 0.0, 0.0]),
                          answer)
+
+    def test_kullback_leibler_batch(self):
+        p = [[0.389, 0.5, 0.25, 0.625, 0.0, 0.0, 0.25], [0.2, 0.3, 0.0, 0.5, 0.0, 0.0, 0.0]]
+        q = [[0.35, 0.563, 0.4, 0.5, 0.0, 0.0, 0.0], [0.2, 0.1, 0.3, 0.4, 0.0, 0.0, 0.0]]
+        answer = shannon.kullback_leibler_batch(p=np.array(p), q=np.array(q))
+        for row, (p_row, q_row) in enumerate(zip(p, q)):
+            self.assertAlmostEqual(answer[row], shannon.kullback_leibler(p=p_row, q=q_row))
+
+    def test_jensen_shannon_batch(self):
+        p = [[0.389, 0.5, 0.25, 0.625, 0.0, 0.0, 0.25], [0.2, 0.3, 0.0, 0.5, 0.0, 0.0, 0.0]]
+        q = [[0.35, 0.563, 0.4, 0.5, 0.0, 0.0, 0.0], [0.2, 0.1, 0.3, 0.4, 0.0, 0.0, 0.0]]
+        answer = shannon.jensen_shannon_batch(p=np.array(p), q=np.array(q))
+        for row, (p_row, q_row) in enumerate(zip(p, q)):
+            self.assertAlmostEqual(answer[row], shannon.jensen_shannon(p=p_row, q=q_row))
+
+    def test_different_sizes(self):
+        p = [0.389, 0.5, 0.25, 0.625, 0.0, 0.0, 0.25]
+        q = [0.35, 0.563, 0.4, 0.5]
+        self.assertAlmostEqual(shannon.kullback_leibler(p=p, q=q),
+                               shannon.kullback_leibler(p=p[:4], q=q))
+        self.assertAlmostEqual(shannon.jensen_shannon(p=p, q=q),
+                               shannon.jensen_shannon(p=p[:4], q=q))
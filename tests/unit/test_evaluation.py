@@ -0,0 +1,484 @@
+import unittest
+
+import numpy as np
+import pandas as pd
+
+from ...scikit_pierre.metrics.evaluation import MeanAveragePrecision, MeanReciprocalRank, \
+    Serendipity, Unexpectedness, MeanAbsoluteCalibrationError, MeanAverageMiscalibration, \
+    AverageNumberOfOItemsChanges, AverageNumberOfGenreChanges, Miscalibration, \
+    IntraListSimilarity, Personalization, Novelty, Coverage
+from ...scikit_pierre.distributions.compute_distribution import transform_to_vec
+from ...scikit_pierre.distributions.compute_tilde_q import compute_tilde_q
+from ...scikit_pierre.measures.accessible import calibration_measures_funcs
+
+MEASURES = [
+    "MINKOWSKI", "EUCLIDEAN", "CITY_BLOCK", "CHEBYSHEV",
+    "SORESEN", "GOWER", "SOERGEL", "KULCZYNSKI_D", "CANBERRA", "LORENTZIAN",
+    "INTERSECTION_SIM", "INTERSECTION_DIV", "WAVE", "CZEKANOWSKI_SIM", "CZEKANOWSKI_DIV",
+    "MOTYKA_SIM", "MOTYKA_DIV", "KULCZYNSKI_S", "RUZICKA", "TONIMOTO",
+    "INNER", "HARMONIC", "COSINE", "KUMAR_HASSEBROOK", "JACCARD", "DICE_SIM", "DICE_DIV",
+    "FIDELITY", "BHATTACHARYYA", "HELLINGER", "MATUSITA", "SQUARED_CHORD_SIM",
+    "SQUARED_CHORD_DIV",
+    "SQUARED_EUCLIDEAN", "CHI_SQUARE", "NEYMAN", "SQUARED_CHI", "PROBABILISTIC_CHI",
+    "DIVERGENCE", "CLARK", "ADDITIVE_CHI",
+    "KL", "JEFFREYS", "K_DIV", "TOPSOE", "JENSEN_SHANNON", "JENSEN_DIFF",
+    "TANEJA", "KUMAR_JOHNSON", "AVG", "WTV",
+    "VICIS_WAVE", "VICIS_EMANON2", "VICIS_EMANON3", "VICIS_EMANON4", "VICIS_EMANON5",
+    "VICIS_EMANON6"
+]
+
+
+class TestBaseEvaluation(unittest.TestCase):
+    def setUp(self):
+        self.test1 = [True, False, True, False]
+        self.test2 = [False, False, False]
+        self.test3 = []
+        self.rec_df = pd.DataFrame([[1, 10, 1], [1, 20, 2], [1, 30, 3],
+                                    [2, 40, 1], [2, 50, 2], [2, 60, 3]],
+                                   columns=["USER_ID", "ITEM_ID", "ORDER"])
+        self.test_df = pd.DataFrame([[1, 30], [1, 10], [2, 50], [2, 70]],
+                                    columns=["USER_ID", "ITEM_ID"])
+        self.baseline_df = pd.DataFrame([[1, 10], [1, 20], [2, 40], [2, 50]],
+                                        columns=["USER_ID", "ITEM_ID"])
+        self.rec_df["PREDICTED_VALUE"] = [0.9, 0.8, 0.7, 0.9, 0.6, 0.5]
+        self.profile_df = pd.DataFrame([[1, 10, 5], [1, 40, 3], [2, 20, 4], [2, 60, 1]],
+                                       columns=["USER_ID", "ITEM_ID", "TRANSACTION_VALUE"])
+        self.items_df = pd.DataFrame([[10, "Drama"], [20, "Comedy|Drama"], [30, "Action"],
+                                      [40, "Action|Comedy"], [50, "Drama"], [60, "Comedy"]],
+                                     columns=["ITEM_ID", "GENRES"])
+
+
+class TestMeanAveragePrecision(TestBaseEvaluation):
+    def test_list_precision(self):
+        answer = np.mean([1 / 1, 1 / 2, 2 / 3, 2 / 4])
+        self.assertAlmostEqual(MeanAveragePrecision.get_list_precision(self.test1), answer)
+
+    def test_list_precision_without_hits(self):
+        self.assertEqual(MeanAveragePrecision.get_list_precision(self.test2), 0.0)
+
+    def test_list_precision_empty(self):
+        self.assertEqual(MeanAveragePrecision.get_list_precision(self.test3), 0.0)
+
+    def test_compute(self):
+        user_1 = np.mean([1 / 1, 1 / 2, 2 / 3])
+        user_2 = np.mean([0 / 1, 1 / 2, 1 / 3])
+        metric = MeanAveragePrecision(users_rec_list_df=self.rec_df.copy(),
+                                      users_test_set_df=self.test_df.copy())
+        self.assertAlmostEqual(metric.compute(), np.mean([user_1, user_2]))
+
+    def test_compute_follows_order(self):
+        user_1 = np.mean([1 / 1, 1 / 2, 2 / 3])
+        user_2 = np.mean([0 / 1, 1 / 2, 1 / 3])
+        metric = MeanAveragePrecision(users_rec_list_df=self.rec_df.iloc[::-1].copy(),
+                                      users_test_set_df=self.test_df.copy())
+        self.assertAlmostEqual(metric.compute(), np.mean([user_1, user_2]))
+
+    def test_compute_with_mixed_users_ids(self):
+        rec_df = pd.DataFrame([["b", 10, 2], ["b", 20, 1], [1, 30, 1], [1, 40, 2]],
+                              columns=["USER_ID", "ITEM_ID", "ORDER"])
+        test_df = pd.DataFrame([[1, 30], ["b", 10]], columns=["USER_ID", "ITEM_ID"])
+        metric = MeanAveragePrecision(users_rec_list_df=rec_df, users_test_set_df=test_df)
+        self.assertAlmostEqual(metric.compute(), np.mean([np.mean([1 / 1, 1 / 2]),
+                                                          np.mean([0 / 1, 1 / 2])]))
+
+    def test_compute_with_different_sizes(self):
+        user_1 = np.mean([1 / 1, 1 / 2, 2 / 3])
+        user_2 = np.mean([0 / 1, 1 / 2])
+        metric = MeanAveragePrecision(users_rec_list_df=self.rec_df.iloc[:-1].copy(),
+                                      users_test_set_df=self.test_df.copy())
+        self.assertAlmostEqual(metric.compute(), np.mean([user_1, user_2]))
+
+
+class TestMeanReciprocalRank(TestBaseEvaluation):
+    def test_list_reciprocal(self):
+        self.assertEqual(MeanReciprocalRank.get_list_reciprocal(self.test1), 1.0)
+        self.assertEqual(MeanReciprocalRank.get_list_reciprocal([False, False, True]), 1 / 3)
+
+    def test_list_reciprocal_without_hits(self):
+        self.assertEqual(MeanReciprocalRank.get_list_reciprocal(self.test2), 0.0)
+        self.assertEqual(MeanReciprocalRank.get_list_reciprocal(self.test3), 0.0)
+
+    def test_compute(self):
+        metric = MeanReciprocalRank(users_rec_list_df=self.rec_df.copy(),
+                                    users_test_set_df=self.test_df.copy())
+        self.assertAlmostEqual(metric.compute(), np.mean([1.0, 1 / 2]))
+
+    def test_compute_with_different_sizes(self):
+        metric = MeanReciprocalRank(users_rec_list_df=self.rec_df.iloc[:-1].copy(),
+                                    users_test_set_df=self.test_df.copy())
+        self.assertAlmostEqual(metric.compute(), np.mean([1.0, 1 / 2]))
+
+    def test_compute_without_hits(self):
+        metric = MeanReciprocalRank(users_rec_list_df=self.rec_df.copy(),
+                                    users_test_set_df=self.baseline_df.assign(ITEM_ID=0))
+        self.assertEqual(metric.compute(), 0.0)
+
+
+class TestSerendipity(TestBaseEvaluation):
+    def test_compute(self):
+        metric = Serendipity(users_rec_list_df=self.rec_df.copy(),
+                             users_test_df=self.test_df.copy(),
+                             users_baseline_df=self.baseline_df.copy())
+        self.assertAlmostEqual(metric.compute(), np.mean([1 / 3, 0.0]))
+
+    def test_compute_without_useful_items(self):
+        metric = Serendipity(users_rec_list_df=self.rec_df.copy(),
+                             users_test_df=self.test_df.assign(ITEM_ID=0),
+                             users_baseline_df=self.baseline_df.copy())
+        self.assertEqual(metric.compute(), 0.0)
+        metric.ordering_and_grouping()
+        for user_baseline, user_rec, user_test in zip(
+                metric.grouped_df_3, metric.grouped_df_2, metric.grouped_df_1
+        ):
+            self.assertIsInstance(
+                metric.single_process_serend(user_baseline, user_rec, user_test), float
+            )
+
+
+class TestUnexpectedness(TestBaseEvaluation):
+    def test_compute(self):
+        metric = Unexpectedness(users_rec_list_df=self.rec_df.copy(),
+                                users_test_df=self.test_df.copy())
+        self.assertAlmostEqual(metric.compute(), np.mean([1 / 3, 2 / 3]))
+
+
+class TestAverageNumberOfOItemsChanges(TestBaseEvaluation):
+    def test_compute(self):
+        metric = AverageNumberOfOItemsChanges(users_rec_list_df=self.rec_df.copy(),
+                                              users_baseline_df=self.baseline_df.assign(ORDER=1))
+        self.assertEqual(metric.compute(), 1.0)
+
+    def test_single_process(self):
+        metric = AverageNumberOfOItemsChanges(users_rec_list_df=self.rec_df.copy(),
+                                              users_baseline_df=self.baseline_df.assign(ORDER=1))
+        metric.ordering_and_grouping()
+        self.assertEqual(
+            [metric.single_process(rec, baseline)
+             for rec, baseline in zip(metric.grouped_df_2, metric.grouped_df_1)],
+            [1, 1]
+        )
+
+
+class TestAverageNumberOfGenreChanges(TestBaseEvaluation):
+    def test_compute(self):
+        metric = AverageNumberOfGenreChanges(users_rec_list_df=self.rec_df.copy(),
+                                             users_baseline_df=self.baseline_df.assign(ORDER=1),
+                                             items_df=self.items_df.copy())
+        self.assertEqual(metric.compute(), 0.5)
+
+    def test_compute_with_string_users(self):
+        baseline_df = self.baseline_df.assign(ORDER=1)
+        baseline_df["USER_ID"] = baseline_df["USER_ID"].astype(str)
+        metric = AverageNumberOfGenreChanges(users_rec_list_df=self.rec_df.copy(),
+                                             users_baseline_df=baseline_df,
+                                             items_df=self.items_df.copy())
+        self.assertEqual(metric.compute(), 0.5)
+
+    def test_compute_with_object_users(self):
+        rec_df = self.rec_df.assign(USER_ID=self.rec_df["USER_ID"].astype(object))
+        baseline_df = self.baseline_df.assign(
+            ORDER=1, USER_ID=self.baseline_df["USER_ID"].astype(str).astype(object)
+        )
+        metric = AverageNumberOfGenreChanges(users_rec_list_df=rec_df,
+                                             users_baseline_df=baseline_df,
+                                             items_df=self.items_df.copy())
+        self.assertEqual(metric.compute(), 0.5)
+
+    def test_compute_in_parallel(self):
+        metric = AverageNumberOfGenreChanges(users_rec_list_df=self.rec_df.copy(),
+                                             users_baseline_df=self.baseline_df.assign(ORDER=1),
+                                             items_df=self.items_df.copy())
+        metric.set_n_jobs(2)
+        self.assertEqual(metric.compute(), 0.5)
+
+    def test_compute_with_unknown_items(self):
+        metric = AverageNumberOfGenreChanges(users_rec_list_df=self.rec_df.assign(ITEM_ID=0),
+                                             users_baseline_df=self.baseline_df.assign(ORDER=1),
+                                             items_df=self.items_df.copy())
+        self.assertEqual(metric.compute(), 0.0)
+
+
+class TestIntraListSimilarity(TestBaseEvaluation):
+    def test_compute(self):
+        metric = IntraListSimilarity(users_rec_list_df=self.rec_df.copy(),
+                                     items_df=self.items_df.copy())
+        answer = metric.compute()
+
+        encoded = metric.encoded.astype(float)
+        similarity = []
+        for user_id in [1, 2]:
+            features = encoded.loc[self.rec_df[self.rec_df["USER_ID"] == user_id]["ITEM_ID"]]
+            features = features.to_numpy() / np.linalg.norm(features.to_numpy(), axis=1)[:, None]
+            similarity.append((features @ features.T)[np.triu_indices(3, k=1)].mean())
+        self.assertAlmostEqual(answer, np.mean(similarity))
+
+    def test_unknown_item(self):
+        rec_df = self.rec_df.copy()
+        rec_df.loc[0, "ITEM_ID"] = 99
+        with self.assertRaises(KeyError):
+            IntraListSimilarity(users_rec_list_df=rec_df, items_df=self.items_df.copy()).compute()
+
+
+class TestPersonalization(TestBaseEvaluation):
+    def test_compute(self):
+        self.assertAlmostEqual(Personalization(users_rec_list_df=self.rec_df.copy()).compute(), 1.0)
+
+        rec_df = self.rec_df.copy()
+        rec_df["ITEM_ID"] = [10, 20, 30, 10, 20, 40]
+        self.assertAlmostEqual(Personalization(users_rec_list_df=rec_df).compute(), 1 / 3)
+
+    def test_rec_matrix(self):
+        rec_df = self.rec_df.copy()
+        rec_df["ITEM_ID"] = [10, 20, 20, 30, 40, 50]
+        matrix = Personalization(users_rec_list_df=rec_df).make_rec_matrix().toarray()
+        np.testing.assert_array_equal(matrix, [[1, 1, 0, 0, 0], [0, 0, 1, 1, 1]])
+
+
+class TestCoverage(TestBaseEvaluation):
+    def test_compute(self):
+        rec_df = self.rec_df.copy()
+        rec_df["ITEM_ID"] = [10, 20, 30, 10, 20, 40]
+        answer = Coverage(users_rec_list_df=rec_df, items_df=self.items_df.copy()).compute()
+        self.assertEqual(answer, round(4 / 6 * 100, 2))
+
+
+class TestNovelty(TestBaseEvaluation):
+    def test_compute(self):
+        answer = Novelty(users_profile_df=self.profile_df.copy(),
+                         users_rec_list_df=self.rec_df.copy(),
+                         items_df=self.items_df.copy()).compute()
+
+        # Popularity among the 2 profile users, the items out of the profile count as 0.00001
+        self_information = {10: -np.log2(1 / 2), 20: -np.log2(1 / 2), 30: -np.log2(0.00001 / 2),
+                            40: -np.log2(1 / 2), 50: -np.log2(0.00001 / 2), 60: -np.log2(1 / 2)}
+        user_1 = sum(self_information[i] for i in [10, 20, 30]) / 3
+        user_2 = sum(self_information[i] for i in [40, 50, 60]) / 3
+        self.assertAlmostEqual(answer, (user_1 + user_2) / 2)
+
+    def test_string_ids(self):
+        def as_str(df):
+            return df.assign(ITEM_ID=df["ITEM_ID"].astype(str))
+        answer = Novelty(users_profile_df=as_str(self.profile_df),
+                         users_rec_list_df=as_str(self.rec_df),
+                         items_df=as_str(self.items_df)).compute()
+        self.assertAlmostEqual(answer, Novelty(users_profile_df=self.profile_df.copy(),
+                                               users_rec_list_df=self.rec_df.copy(),
+                                               items_df=self.items_df.copy()).compute())
+
+
+class TestPositionBasedCalibration(TestBaseEvaluation):
+    def position_reference(self, metric):
+        metric.checking_users()
+        metric.compute_target_dist()
+        metric.users_ix = list(metric.target_dist.keys())
+        return np.mean([
+            metric.based_on_position(rec_pos_df=self.rec_df[self.rec_df["ORDER"] <= i].copy())
+            for i in range(1, self.rec_df["ORDER"].max() + 1)
+        ])
+
+    def test_mean_absolute_calibration_error(self):
+        def build():
+            return MeanAbsoluteCalibrationError(
+                users_profile_df=self.profile_df.copy(), users_rec_list_df=self.rec_df.copy(),
+                items_set_df=self.items_df.copy()
+            )
+        self.assertAlmostEqual(build().compute(), self.position_reference(build()))
+
+    def test_cumulative_distributions(self):
+        for distribution_name in ["WPS", "PGD_P", "TWB", "GLEB"]:
+            def build():
+                return MeanAbsoluteCalibrationError(
+                    users_profile_df=self.profile_df.assign(TIMESTAMP=[10, 20, 10, 30]),
+                    users_rec_list_df=self.rec_df.iloc[::-1].copy(),
+                    items_set_df=self.items_df.copy(), distribution_name=distribution_name
+                )
+            self.assertAlmostEqual(build().compute(), self.position_reference(build()))
+
+    def test_mean_average_miscalibration(self):
+        def build():
+            return MeanAverageMiscalibration(
+                users_profile_df=self.profile_df.copy(), users_rec_list_df=self.rec_df.copy(),
+                items_set_df=self.items_df.copy()
+            )
+        self.assertAlmostEqual(build().compute(), self.position_reference(build()))
+
+    def test_miscalibration_in_parallel(self):
+        def build():
+            return Miscalibration(
+                users_profile_df=self.profile_df.copy(), users_rec_list_df=self.rec_df.copy(),
+                items_set_df=self.items_df.copy(), distance_func_name="HELLINGER"
+            )
+        metric = build()
+        metric.set_n_jobs(2)
+        self.assertAlmostEqual(metric.compute(), build().compute())
+
+    def test_target_and_realized_share_items_lookup(self):
+        metric = Miscalibration(
+            users_profile_df=self.profile_df.copy(), users_rec_list_df=self.rec_df.copy(),
+            items_set_df=self.items_df.copy()
+        )
+        calls = []
+        compute_distribution = metric.compute_distribution
+
+        def spy(set_df):
+            calls.append(metric._item_in_memory)
+            return compute_distribution(set_df)
+
+        metric.compute_distribution = spy
+        metric.compute_target_and_realized_dist()
+        # The target distributions may come from the memo, the realized ones are computed
+        self.assertGreaterEqual(len(calls), 1)
+        for item_in_memory in calls:
+            self.assertIsNotNone(item_in_memory)
+            self.assertIs(item_in_memory, metric._item_in_memory)
+
+    def test_shared_target_distribution(self):
+        profile_df = self.profile_df.copy()
+        items_df = self.items_df.copy()
+        metrics = [
+            metric_class(users_profile_df=profile_df, users_rec_list_df=self.rec_df.copy(),
+                         items_set_df=items_df)
+            for metric_class in [MeanAbsoluteCalibrationError, Miscalibration]
+        ]
+        for metric in metrics:
+            metric.compute()
+        self.assertIs(metrics[0].target_dist, metrics[1].target_dist)
+        self.assertIs(metrics[0]._item_in_memory, metrics[1]._item_in_memory)
+
+        other = Miscalibration(users_profile_df=profile_df, users_rec_list_df=self.rec_df.copy(),
+                               items_set_df=items_df, distribution_name="WPS")
+        other.compute()
+        self.assertIsNot(other.target_dist, metrics[0].target_dist)
+
+    def test_shared_target_distribution_follows_changes(self):
+        profile_df = self.profile_df.copy()
+        metric = Miscalibration(users_profile_df=profile_df, users_rec_list_df=self.rec_df.copy(),
+                                items_set_df=self.items_df)
+        metric.compute()
+        profile_df["ITEM_ID"] = [30, 50, 20, 60]
+        other = Miscalibration(users_profile_df=profile_df, users_rec_list_df=self.rec_df.copy(),
+                               items_set_df=self.items_df)
+        other.compute()
+        self.assertIsNot(other.target_dist, metric.target_dist)
+        self.assertNotEqual(other.target_dist, metric.target_dist)
+
+    def test_ace_batch(self):
+        metric = MeanAbsoluteCalibrationError(
+            users_profile_df=self.profile_df.copy(), users_rec_list_df=self.rec_df.copy(),
+            items_set_df=self.items_df.copy()
+        )
+        metric.compute_target_and_realized_dist()
+        metric.users_ix = list(metric.target_dist.keys())
+        answer = [metric.compute_ace(metric.target_dist[ix], metric.realized_dist[ix])
+                  for ix in metric.users_ix]
+        np.testing.assert_allclose(metric.compute_ace_batch(metric.realized_dist), answer)
+
+    def test_cached_target_vectors(self):
+        metric = Miscalibration(
+            users_profile_df=self.profile_df.copy(), users_rec_list_df=self.rec_df.copy(),
+            items_set_df=self.items_df.copy(), distance_func_name="HELLINGER"
+        )
+        metric.compute_target_and_realized_dist()
+        metric.users_ix = list(metric.target_dist.keys())
+        answer = [
+            metric.user_miscalibration(
+                metric.calib_measure_func, metric.target_dist[ix], metric.realized_dist[ix]
+            )
+            for ix in metric.users_ix
+        ]
+        np.testing.assert_allclose(metric.map_users_miscalibration(metric.realized_dist), answer)
+        ix = metric.users_ix[0]
+        self.assertIs(metric.get_target_vector(ix), metric.get_target_vector(ix))
+
+    def test_miscalibration_follows_list_inputs(self):
+        for measure in MEASURES:
+            with self.subTest(measure=measure):
+                metric = Miscalibration(
+                    users_profile_df=self.profile_df.copy(), users_rec_list_df=self.rec_df.copy(),
+                    items_set_df=self.items_df.copy(), distance_func_name=measure
+                )
+                value = metric.compute()
+                calib_measure_func = calibration_measures_funcs(measure=measure)
+                answer = []
+                for ix in metric.users_ix:
+                    p, q = transform_to_vec(metric.target_dist[ix], metric.realized_dist[ix])
+                    answer.append(calib_measure_func(p=p, q=compute_tilde_q(p=p, q=q)))
+                np.testing.assert_allclose(value, np.mean(answer))
+
+    def test_users_miscalibration(self):
+        metric = Miscalibration(
+            users_profile_df=self.profile_df.copy(), users_rec_list_df=self.rec_df.copy(),
+            items_set_df=self.items_df.copy(), distance_func_name="KL"
+        )
+        metric.compute_target_and_realized_dist()
+        metric.users_ix = list(metric.target_dist.keys())
+        answer = metric.users_miscalibration(metric.realized_dist)
+        self.assertIsInstance(answer, np.ndarray)
+        np.testing.assert_allclose(answer, metric.map_users_miscalibration(metric.realized_dist))
+
+
+class TestOrdering(TestBaseEvaluation):
+    def test_sort_if_needed(self):
+        rec_df = Serendipity.sort_if_needed(self.rec_df.iloc[::-1], by=["USER_ID", "ORDER"])
+        self.assertEqual(rec_df["ITEM_ID"].tolist(), self.rec_df["ITEM_ID"].tolist())
+        self.assertIs(Serendipity.sort_if_needed(rec_df, by=["USER_ID", "ORDER"]), rec_df)
+        self.assertIs(Serendipity.sort_if_needed(rec_df, by=["USER_ID"]), rec_df)
+
+    def test_sort_if_needed_is_stable(self):
+        rec_df = self.rec_df.iloc[::-1]
+        self.assertEqual(
+            Serendipity.sort_if_needed(rec_df, by=["USER_ID"])["ITEM_ID"].tolist(),
+            [30, 20, 10, 60, 50, 40]
+        )
+
+    def test_ordering_keeps_the_given_dataframes(self):
+        rec_df = self.rec_df.iloc[::-1].copy()
+        metric = AverageNumberOfOItemsChanges(users_rec_list_df=rec_df,
+                                              users_baseline_df=self.baseline_df.assign(ORDER=1))
+        metric.ordering()
+        self.assertEqual(metric.df_2["ITEM_ID"].tolist(), self.rec_df["ITEM_ID"].tolist())
+        self.assertEqual(rec_df["ITEM_ID"].tolist(), self.rec_df["ITEM_ID"].tolist()[::-1])
+
+
+class TestUsersItems(TestBaseEvaluation):
+    def test_shared_users_items(self):
+        rec_df = self.rec_df.iloc[::-1].copy()
+        users_items = Serendipity.get_users_items(rec_df)
+        self.assertEqual(list(users_items.keys()), [1, 2])
+        np.testing.assert_array_equal(users_items[2], [60, 50, 40])
+        self.assertIs(Personalization.get_users_items(rec_df)[2], users_items[2])
+        self.assertFalse(users_items[2].flags.writeable)
+
+    def test_shared_users_items_follows_changes(self):
+        rec_df = self.rec_df.copy()
+        users_items = Serendipity.get_users_items(rec_df)
+        rec_df["ITEM_ID"] = rec_df["ITEM_ID"] + 1
+        np.testing.assert_array_equal(Serendipity.get_users_items(rec_df)[2], [41, 51, 61])
+        np.testing.assert_array_equal(users_items[2], [40, 50, 60])
+
+
+class TestCheckingUsers(TestBaseEvaluation):
+    def test_same_users(self):
+        test_df = self.test_df.assign(USER_ID=self.test_df["USER_ID"].astype(str))
+        metric = MeanAveragePrecision(users_rec_list_df=self.rec_df.copy(),
+                                      users_test_set_df=test_df)
+        metric.checking_users()
+
+    def test_same_users_with_object_ids(self):
+        rec_df = self.rec_df.assign(USER_ID=self.rec_df["USER_ID"].astype(object))
+        test_df = self.test_df.assign(
+            USER_ID=self.test_df["USER_ID"].astype(str).astype(object)
+        )
+        self.assertTrue(MeanAveragePrecision.users_ids_as_str(rec_df["USER_ID"],
+                                                              test_df["USER_ID"]))
+        metric = MeanAveragePrecision(users_rec_list_df=rec_df, users_test_set_df=test_df)
+        metric.checking_users()
+        self.assertAlmostEqual(metric.compute(), np.mean([np.mean([1 / 1, 1 / 2, 2 / 3]),
+                                                          np.mean([0 / 1, 1 / 2, 1 / 3])]))
+        metric = MeanReciprocalRank(users_rec_list_df=rec_df, users_test_set_df=test_df)
+        self.assertAlmostEqual(metric.compute(), np.mean([1 / 1, 1 / 2]))
+
+    def test_unknown_users(self):
+        metric = MeanAveragePrecision(users_rec_list_df=self.rec_df.copy(),
+                                      users_test_set_df=self.test_df.assign(USER_ID=[1, 1, 3, 3]))
+        self.assertRaises(IndexError, metric.checking_users)